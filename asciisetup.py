@@ -1,78 +1,317 @@
 import gamesetup as gs
 import pygame
+import array, functools, heapq, math, mmap, os, shutil, sys
+
+class _AsciiFrame:
+    '''private class for a compiled ascii frame
+    stores the opaque (dr, dc, char) cells and their bounding box
+    compiled frames are never changed, so they can be shared'''
+    __slots__ = ("text", "cells", "opaque", "top", "left", "bottom", "right")
+
+    def __init__(self, text):
+        '''_AsciiFrame(str) -> _AsciiFrame
+        compiles the ascii art into its opaque cells'''
+        self.text = text
+        cells = []
+        for dr, line in enumerate(text.split("\n")):
+            for dc, char in enumerate(line):
+                if char != ' ':
+                    cells.append((dr, dc, char))
+        self.cells = tuple(cells)
+        self.opaque = frozenset((dr, dc) for dr, dc, char in cells)
+
+        # bounding box of the opaque cells (bottom and right are exclusive)
+        if cells:
+            self.top = min(cell[0] for cell in cells)
+            self.left = min(cell[1] for cell in cells)
+            self.bottom = max(cell[0] for cell in cells) + 1
+            self.right = max(cell[1] for cell in cells) + 1
+        else:
+            self.top = self.left = self.bottom = self.right = 0
 
-class AsciiWindow(pygame.Surface):
-    '''AsciiWindow inherits from Surface
-    creates a surface that's configured for ascii art games'''
-
-    def __init__(self, game, size = (500, 500), fontSize = 12, fillColor = 0):
-        '''AsciiWindow(Game, (int, int), int) -> AsciiWindow
-        sets up the ascii window'''
-        pygame.Surface.__init__(self, size)
+    def is_opaque_at(self, dr, dc):
+        '''_AsciiFrame.is_opaque_at(int, int) -> bool
+        returns if the cell at dr, dc (relative to the frame) is not a space'''
+        if not (self.top <= dr < self.bottom and self.left <= dc < self.right):
+            return False
+        return (dr, dc) in self.opaque
+
+@functools.lru_cache(maxsize=1024)
+def compile_ascii(art):
+    '''compile_ascii(str) -> _AsciiFrame
+    compiles ascii art into a frame of opaque cells
+    the same art always returns the same shared frame'''
+    return _AsciiFrame(art)
+
+@functools.lru_cache(maxsize=256)
+def _compile_frames(frames):
+    '''_compile_frames(tuple) -> tuple
+    compiles a tuple of ascii frames. shared between sprites using the same frames'''
+    return tuple(compile_ascii(frame) for frame in frames)
+
+def _as_frame(art):
+    '''_as_frame(str/_AsciiFrame) -> _AsciiFrame
+    returns art as a compiled frame'''
+    if isinstance(art, _AsciiFrame):
+        return art
+    return compile_ascii(art)
+
+class AsciiTicker:
+    '''shared animation scheduler for ascii frame bundles
+    every delay gets one track that counts how many times the delay has passed
+    bundles with the same delay read the same track, so they advance in lockstep'''
 
-        # window attributes
+    def __init__(self):
+        '''AsciiTicker() -> AsciiTicker
+        sets up the ticker with no tracks'''
+        self.tracks = {}
+        self.schedule = []
+        self.now = None
+
+    def get_time(self):
+        '''AsciiTicker.get_time() -> float
+        returns the timestamp of the last tick'''
+        if self.now == None:
+            return gs.now()
+        return self.now
+
+    def register(self, delay):
+        '''AsciiTicker.register(int) -> None
+        sets up a track for delay (in ms) if there isn't one yet'''
+        if delay in self.tracks:
+            return
+        nextDue = self.get_time() + delay / 1000
+        self.tracks[delay] = [0, nextDue]
+        heapq.heappush(self.schedule, (nextDue, delay))
+
+    def get_ticks(self, delay):
+        '''AsciiTicker.get_ticks(int) -> int
+        returns the number of times the delay (in ms) has passed on its track'''
+        if delay not in self.tracks:
+            self.register(delay)
+        return self.tracks[delay][0]
+
+    def tick(self, now = None):
+        '''AsciiTicker.tick(float) -> None
+        advances all tracks that are due at the timestamp now
+        tracks that are not due yet are never looked at'''
+        if now == None:
+            now = gs.now()
+        self.now = now
+
+        # pop every due track first so zero delays only advance once per tick
+        due = []
+        while len(self.schedule) > 0 and self.schedule[0][0] <= now:
+            due.append(heapq.heappop(self.schedule))
+
+        for dueTime, delay in due:
+            track = self.tracks[delay]
+            if delay > 0:
+                # catch up on every delay that passed since the last tick
+                passed = int((now - dueTime) // (delay / 1000)) + 1
+                track[1] = dueTime + passed * delay / 1000
+            else:
+                passed = 1
+                track[1] = now
+            track[0] += passed
+            heapq.heappush(self.schedule, (track[1], delay))
+
+_sharedTicker = AsciiTicker()
+
+def get_shared_ticker():
+    '''get_shared_ticker() -> AsciiTicker
+    returns the ticker used by default for all ascii windows'''
+    return _sharedTicker
+
+class AsciiMap:
+    '''represents an ascii map file that is memory-mapped
+    the line offsets are indexed once and rows are only decoded when asked for
+    works like a read-only list of lines'''
+
+    def __init__(self, path, encoding = "utf-8", cacheSize = 512):
+        '''AsciiMap(str, str, int) -> AsciiMap
+        opens the map file at path
+        cacheSize is the number of decoded rows kept around'''
+        self.path = path
+        self.encoding = encoding
+        self.rows = gs.LRUCache(cacheSize)
+        self.file = open(path, "rb")
+
+        # empty files can't be memory-mapped
+        if os.fstat(self.file.fileno()).st_size > 0:
+            self.data = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+        else:
+            self.data = b""
+
+        # index where every line starts
+        self.offsets = array.array("q", [0])
+        find = self.data.find
+        position = find(b"\n")
+        while position != -1:
+            self.offsets.append(position + 1)
+            position = find(b"\n", position + 1)
+
+    def __len__(self):
+        '''len(AsciiMap) -> int
+        returns the number of rows in the map'''
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        '''AsciiMap[int] -> str
+        AsciiMap[slice] -> list
+        returns the decoded row (or rows for a slice)'''
+        if isinstance(index, slice):
+            return [self.get_row(row) for row in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("AsciiMap row out of range")
+        return self.get_row(index)
+
+    def __str__(self):
+        '''str(AsciiMap) -> str
+        returns the whole map as text (decodes the entire file)'''
+        return "\n".join(self[:])
+
+    def get_row(self, row):
+        '''AsciiMap.get_row(int) -> str
+        returns the decoded row, using the cache of recently used rows'''
+        line = self.rows.get(row)
+        if line == None:
+            start = self.offsets[row]
+            end = self.offsets[row + 1] - 1 if row + 1 < len(self.offsets) else len(self.data)
+            line = self.data[start:end].decode(self.encoding, "replace").rstrip("\r")
+            self.rows.set(row, line)
+        return line
+
+    def close(self):
+        '''AsciiMap.close() -> None
+        closes the map file'''
+        self.rows.clear()
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self.file.close()
+
+class AsciiCanvas:
+    '''composes the background, sprites, buttons and writing of an ascii game
+    into a grid of characters. it is shared by all the ways to display them
+    (AsciiWindow for pygame and AsciiTerminal for terminals)'''
+
+    def __init__(self, rows, cols, ticker = None):
+        '''AsciiCanvas(int, int, AsciiTicker) -> AsciiCanvas
+        sets up the canvas with a viewport of rows and cols
+        ticker animates the sprites. defaults to the shared ticker
+        the display must set charWidth and charHeight (the pixels of one character)'''
         self.baseBg = ""
+        self.baseLines = [""]
         self.currentBg = ""
         self.bgColor = (0, 0, 0)
         self.textColor = (255, 255, 255)
         self.sprites = []
-        self.font = pygame.font.SysFont("courier", fontSize)
-        self.fontSize = fontSize
         self.colorMap = {}
         self.scheduledDrawings = []
         self.permanentInk = {}
         self.buttons = {}
-        
-        # calculate consistent character dimensions
-        self.charSpacing = self.fontSize / 3
-        self.charWidth, self.charHeight = self.calculate_char_dimensions()
+        self.ticker = ticker if ticker != None else _sharedTicker
 
-    def calculate_char_dimensions(self):
-        '''AsciiWindow.calculate_char_dimensions() -> (int, int)
-        calculates consistent character width and height for square characters'''
-        # test with a common character to get dimensions
-        testChar = self.font.render(".", True, (255, 255, 255))
-        charWidth = testChar.get_width()
-        charHeight = testChar.get_height()
-        
-        # ensure square characters by using the smaller dimension
-        # this keeps ASCII art proportional
-        squareSize = min(charWidth, charHeight)
-        return squareSize + self.charSpacing, squareSize + self.charSpacing
+        # the viewport is [row, col, rows, cols] of the background that is visible
+        self.viewport = [0, 0, rows, cols]
 
     def set_base_bg(self, textColor, bgColor, text, isTextFile = False):
-        '''AsciiWindow.set_base_bg((int, int, int), (int, int, int), str, bool) -> None
+        '''AsciiCanvas.set_base_bg((int, int, int), (int, int, int), str, bool) -> None
         sets the base background color and ascii.
-        If isTextFile is set to true, it will open a file and get the ascii there'''
+        If isTextFile is set to true, it will memory-map the file and only read the rows in view
+        text can also be an AsciiMap'''
         self.bgColor = bgColor
         self.textColor = textColor
 
+        # close the last map file
+        if isinstance(self.baseLines, AsciiMap) and self.baseLines is not text:
+            self.baseLines.close()
+
         # get ascii
-        if isTextFile:
+        if isinstance(text, AsciiMap):
+            self.baseBg = None
+            self.baseLines = text
+        elif isTextFile:
             try:
-                with open(text, 'r') as file:
-                    self.baseBg = file.read()
+                self.baseBg = None
+                self.baseLines = AsciiMap(text)
             except FileNotFoundError:
                 self.baseBg = text
+                self.baseLines = self.baseBg.split("\n")
         else:
             self.baseBg = text
+            self.baseLines = self.baseBg.split("\n")
 
     def get_bg(self, isBase = False):
-        '''AsciiWindow.get_bg(bool) -> str
+        '''AsciiCanvas.get_bg(bool) -> str
         returns the base background if isBase = True
-        otherwise, returns updated background'''
+        otherwise, returns updated background inside the viewport'''
         if isBase:
+            if self.baseBg == None:
+                return str(self.baseLines)
             return self.baseBg
         return self.currentBg
 
+    def get_viewport(self):
+        '''AsciiCanvas.get_viewport() -> (int, int, int, int)
+        returns the row, col, rows and cols of the visible part of the background'''
+        return tuple(self.viewport)
+
+    def set_viewport(self, row, col, rows = None, cols = None):
+        '''AsciiCanvas.set_viewport(int, int, int, int) -> None
+        sets the top-left row and col of the visible part of the background
+        rows and cols set the visible size (unchanged if not given)'''
+        self.viewport[0] = max(0, int(row))
+        self.viewport[1] = max(0, int(col))
+        if rows != None:
+            self.viewport[2] = max(0, int(rows))
+        if cols != None:
+            self.viewport[3] = max(0, int(cols))
+
+    def scroll(self, rows = 0, cols = 0):
+        '''AsciiCanvas.scroll(int, int) -> None
+        moves the viewport by rows and cols'''
+        self.set_viewport(self.viewport[0] + rows, self.viewport[1] + cols)
+
+    def center_viewport_at(self, position):
+        '''AsciiCanvas.center_viewport_at((int, int)) -> None
+        centers the viewport on the row and col of the background'''
+        self.set_viewport(position[0] - self.viewport[2] // 2, position[1] - self.viewport[3] // 2)
+
+    def to_view(self, position):
+        '''AsciiCanvas.to_view((int, int)) -> (int, int)
+        converts a background row and col to a row and col inside the viewport'''
+        return position[0] - self.viewport[0], position[1] - self.viewport[1]
+
+    def pixel_to_cell(self, pixel):
+        '''AsciiCanvas.pixel_to_cell((float, float)) -> (int, int)
+        converts an x,y pixel on the window to the background row and col under it'''
+        return int(pixel[1] // self.charHeight) + self.viewport[0], \
+            int(pixel[0] // self.charWidth) + self.viewport[1]
+
+    def is_in_view(self, art, position):
+        '''AsciiCanvas.is_in_view(str, (int, int)) -> bool
+        returns if any of the ascii art at the row, col is inside the viewport'''
+        frame = _as_frame(art)
+        row, col = self.to_view(position)
+        return frame.bottom > frame.top and \
+            row + frame.bottom > 0 and row + frame.top < self.viewport[2] and \
+            col + frame.right > 0 and col + frame.left < self.viewport[3]
+
     def draw(self, newAsciiArt, position, color = None):
-        '''AsciiWIndow.draw(str, (int, int), str) -> None
+        '''AsciiCanvas.draw(str, (int, int), str) -> None
         adds the ascii for a sprite to the background
-        preserves the base background'''
-        self.scheduledDrawings.append([newAsciiArt, position, color])
+        preserves the base background
+        newAsciiArt can be a str or a compiled frame from compile_ascii
+        drawings outside of the viewport are skipped'''
+        frame = _as_frame(newAsciiArt)
+        if self.is_in_view(frame, position):
+            self.scheduledDrawings.append([frame, position, color])
 
     def write(self, text, position, color = None, leftAligned = True):
-        '''AsciiWindow.write(str, (int, int), str, bool) -> None
+        '''AsciiCanvas.write(str, (int, int), str, bool) -> None
         writes text at location using color
         set leftAligned to False to make the text right aligned'''
         row = position[0]
@@ -80,77 +319,77 @@ class AsciiWindow(pygame.Surface):
         self.draw(text, (row, col), color)
 
     def permanent_ink(self, ref, text, position, color = None, leftAligned = True):
-        '''AsciiWindow.permanent_ink(str str, (int, int), str, bool) -> None
+        '''AsciiCanvas.permanent_ink(str str, (int, int), str, bool) -> None
         writes text at location using color
         set leftAligned to False to make the text right aligned
         text will not going away when written
         can be deleted using the ref'''
         row = position[0]
         col = position[1] if leftAligned else position[1] - len(text)
-        self.permanentInk[ref] = [text, (row, col), color]
+        self.permanentInk[ref] = [_as_frame(text), (row, col), color]
 
     def delete_permanent_ink(self, ref):
-        '''AsciiWindow.delete_permanent_ink(str) -> None
+        '''AsciiCanvas.delete_permanent_ink(str) -> None
         deletes a permanent ink text using its ref'''
         if ref in self.permanentInk:
             self.permanentInk.pop(ref)
 
+    def get_ticker(self):
+        '''AsciiCanvas.get_ticker() -> AsciiTicker
+        returns the ticker that animates the sprites'''
+        return self.ticker
+
     def get_sprites(self):
-        '''AsciiWindow.get_sprites() -> list
+        '''AsciiCanvas.get_sprites() -> list
         returns the list of sprites'''
         return self.sprites
 
     def add_sprite(self, sprite):
-        '''AsciiWindow.add_sprite() -> None
+        '''AsciiCanvas.add_sprite() -> None
         adds a sprite to the window'''
         if not sprite in self.sprites:
             self.sprites.append(sprite)
 
     def _insert_ascii_in_bg(self, bg, art, position, color = None):
-        '''AsciiWindow._insert_ascii_in_bg(str, str, (int, int)) -> str
+        '''AsciiCanvas._insert_ascii_in_bg(str, str, (int, int)) -> str
         inserts the ascii art at the row, col in the background'''
-        bgLines = bg.split("\n")
-        artLines = art.split("\n")
+        grid = [list(line) for line in bg.split("\n")]
+        self._insert_frame_in_grid(grid, _as_frame(art), position, color)
+        return "\n".join("".join(line) for line in grid)
+
+    def _insert_frame_in_grid(self, grid, frame, position, color = None, maxCol = None):
+        '''AsciiCanvas._insert_frame_in_grid(list, _AsciiFrame, (int, int), str, int) -> None
+        inserts the compiled frame at the row, col in the grid of background characters
+        columns at or past maxCol are left out'''
         row, col = position
-        
-        for index in range(len(artLines)):
-            targetRow = row + index
-            
+        numRows = len(grid)
+
+        # skip frames that are completely outside of the background
+        if row + frame.top >= numRows or row + frame.bottom <= 0 or col + frame.right <= 0 or \
+                (maxCol != None and col + frame.left >= maxCol):
+            return
+
+        for dr, dc, char in frame.cells:
+            targetRow = row + dr
+            targetCol = col + dc
+
             # skip if we're trying to insert beyond the background
-            if targetRow >= len(bgLines):
-                break
-                
-            # get the current background line
-            bgLine = bgLines[targetRow]
-            
-            # if the insertion point is beyond the current line length, pad with spaces
-            if col > len(bgLine):
-                bgLine = bgLine.ljust(col)
-            
-            # replace characters in the background with art characters
-            bgLineList = list(bgLine)
-            artLine = artLines[index]
-            
-            for i in range(len(artLine)):
-                targetCol = col + i
-                if artLine[i] != ' ':
-                    if targetCol < len(bgLineList):
-                        bgLineList[targetCol] = artLine[i]
-                    else:
-                        # extend the line if needed for non-space characters
-                        bgLineList.extend([' '] * (targetCol - len(bgLineList) + 1))
-                        bgLineList[targetCol] = artLine[i]
-
-                    # add color at location if needed
-                    if color != None:
-                        self.colorMap[(targetRow, targetCol)] = color
-        
-            bgLines[targetRow] = ''.join(bgLineList)
-    
-        return "\n".join(bgLines)
+            if targetRow >= numRows or targetRow < 0 or targetCol < 0 or \
+                    (maxCol != None and targetCol >= maxCol):
+                continue
+
+            # extend the line if needed for non-space characters
+            line = grid[targetRow]
+            if targetCol >= len(line):
+                line.extend(' ' * (targetCol - len(line) + 1))
+            line[targetCol] = char
+
+            # add color at location if needed
+            if color != None:
+                self.colorMap[(targetRow, targetCol)] = color
 
     def is_touching_sprite(self, ref, coord):
-        '''AsciiWindow.is_touching_sprite(str, (float, float)) -> bool
+        '''AsciiCanvas.is_touching_sprite(str, (float, float)) -> bool
         returns if the x,y coordinate overlaps with any non space characters in the sprite'''
         # find the sprite with the given ref
         targetSprite = None
@@ -163,28 +402,21 @@ class AsciiWindow(pygame.Surface):
             return False
             
         # get the current frame of the sprite
-        currentFrame = targetSprite.get_current_frame()
-        if not currentFrame:
+        currentFrame = targetSprite.get_compiled_frame()
+        if currentFrame == None:
             return False
             
         # convert pixel coordinates to character coordinates
-        charRow = int(coord[1] // self.charHeight)
-        charCol = int(coord[0] // self.charWidth)
+        charRow, charCol = self.pixel_to_cell(coord)
         
         # get sprite position
         spriteRow, spriteCol = targetSprite.pos()
         
         # check if coordinate is within sprite bounds
-        frameLines = currentFrame.split('\n')
-        for i, line in enumerate(frameLines):
-            for j, char in enumerate(line):
-                if char != ' ':
-                    if charRow == spriteRow + i and charCol == spriteCol + j:
-                        return True
-        return False
+        return currentFrame.is_opaque_at(charRow - spriteRow, charCol - spriteCol)
 
     def add_button(self, ref, text, position, action, color = (200, 200, 200), hoverColor = (255, 255, 0)):
-        '''AsciiWindow.add_button(str, str, (int, int), function, (int, int, int), (int, int, int)) -> None
+        '''AsciiCanvas.add_button(str, str, (int, int), function, (int, int, int), (int, int, int)) -> None
         adds a button to the window
         color: default button color (default: light gray)
         hoverColor: color when mouse hovers over button (default: yellow)'''
@@ -200,7 +432,7 @@ class AsciiWindow(pygame.Surface):
         }
 
     def update_button(self, ref, text = None, position = None, action = None, isVisible = None, isDisabled = None, color = None, hoverColor = None):
-        '''AsciiWindow.update_button(str, str, (int, int), function, bool, bool, (int, int, int), (int, int, int)) -> None
+        '''AsciiCanvas.update_button(str, str, (int, int), function, bool, bool, (int, int, int), (int, int, int)) -> None
         updates a current button using the ref
         color: new button color
         hoverColor: new hover color'''
@@ -224,10 +456,9 @@ class AsciiWindow(pygame.Surface):
             button['hoverColor'] = hoverColor
 
     def handle_mouse_click(self, mousePos):
-        '''AsciiWindow.handle_mouse_click((int, int)) -> None
+        '''AsciiCanvas.handle_mouse_click((int, int)) -> None
         handles mouse clicks for buttons'''
-        charRow = int(mousePos[1] // self.charHeight)
-        charCol = int(mousePos[0] // self.charWidth)
+        charRow, charCol = self.pixel_to_cell(mousePos)
         
         for ref, button in self.buttons.items():
             if not button['isVisible'] or button['isDisabled']:
@@ -244,10 +475,9 @@ class AsciiWindow(pygame.Surface):
                 break
 
     def handle_mouse_move(self, mousePos):
-        '''AsciiWindow.handle_mouse_move((int, int)) -> None
+        '''AsciiCanvas.handle_mouse_move((int, int)) -> None
         handles mouse movement for button hover'''
-        charRow = int(mousePos[1] // self.charHeight)
-        charCol = int(mousePos[0] // self.charWidth)
+        charRow, charCol = self.pixel_to_cell(mousePos)
         
         for ref, button in self.buttons.items():
             if not button['isVisible'] or button['isDisabled']:
@@ -261,15 +491,19 @@ class AsciiWindow(pygame.Surface):
             button['isHovered'] = (charRow == buttonRow and 
                                  buttonCol <= charCol < buttonCol + len(buttonText))
 
-    def update(self):
-        '''AsciiWindow.update() -> None
-        updates the ascii window'''
-        # update the background color
-        self.fill(self.bgColor)
-
-        # start with background text
+    def compose(self):
+        '''AsciiCanvas.compose() -> list
+        updates the sprites and builds the grid of characters inside the viewport
+        returns the grid as a list of rows, each row is a list of characters'''
+        # start with the background text inside the viewport
+        # the color map uses rows and cols inside the viewport
         self.colorMap.clear()
-        self.currentBg = self.baseBg
+        viewRow, viewCol, viewRows, viewCols = self.viewport
+        grid = [list(line[viewCol:viewCol + viewCols])
+            for line in self.baseLines[viewRow:viewRow + viewRows]]
+
+        # advance the animations once for the whole frame
+        self.ticker.tick()
         
         # add all sprites to the background
         for sprite in self.sprites:
@@ -291,32 +525,176 @@ class AsciiWindow(pygame.Surface):
         # now actually draw everything
         for ink in self.permanentInk:
             text = self.permanentInk[ink]
-            self.currentBg = self._insert_ascii_in_bg(self.currentBg, text[0], text[1], text[2])
+            if self.is_in_view(text[0], text[1]):
+                self._insert_frame_in_grid(grid, text[0], self.to_view(text[1]), text[2], viewCols)
         for drawing in self.scheduledDrawings:
-            self.currentBg = self._insert_ascii_in_bg(self.currentBg, drawing[0], drawing[1], drawing[2])
+            self._insert_frame_in_grid(grid, drawing[0], self.to_view(drawing[1]), drawing[2], viewCols)
         self.scheduledDrawings.clear()
+        self.currentBg = "\n".join("".join(line) for line in grid)
+        
+        return grid
+
+class AsciiWindow(pygame.Surface, AsciiCanvas):
+    '''AsciiWindow inherits from Surface
+    creates a surface that's configured for ascii art games'''
+
+    def __init__(self, game, size = (500, 500), fontSize = 12, fillColor = 0, ticker = None):
+        '''AsciiWindow(Game, (int, int), int, int, AsciiTicker) -> AsciiWindow
+        sets up the ascii window
+        ticker animates the sprites. defaults to the shared ticker'''
+        pygame.Surface.__init__(self, size)
+
+        # window attributes
+        self.font = gs.get_font("courier", fontSize)
+        self.fontSize = fontSize
         
+        # calculate consistent character dimensions
+        self.charSpacing = self.fontSize / 3
+        self.charWidth, self.charHeight = self.calculate_char_dimensions()
+        AsciiCanvas.__init__(self, math.ceil(size[1] / self.charHeight),
+            math.ceil(size[0] / self.charWidth), ticker)
+
+    def calculate_char_dimensions(self):
+        '''AsciiWindow.calculate_char_dimensions() -> (int, int)
+        calculates consistent character width and height for square characters'''
+        # test with a common character to get dimensions
+        testChar = self.font.render(".", True, (255, 255, 255))
+        charWidth = testChar.get_width()
+        charHeight = testChar.get_height()
+        
+        # ensure square characters by using the smaller dimension
+        # this keeps ASCII art proportional
+        squareSize = min(charWidth, charHeight)
+        return squareSize + self.charSpacing, squareSize + self.charSpacing
+
+    def scroll(self, rows = 0, cols = 0):
+        '''AsciiWindow.scroll(int, int) -> None
+        moves the viewport by rows and cols
+        overrides pygame.Surface.scroll, which would move the pixels instead'''
+        AsciiCanvas.scroll(self, rows, cols)
+
+    def update(self):
+        '''AsciiWindow.update() -> None
+        updates the ascii window'''
+        # update the background color
+        self.fill(self.bgColor)
+        grid = self.compose()
+
         # render the text with consistent character spacing
-        if self.currentBg:
-            lines = self.currentBg.split('\n')
-            yOffset = 0
-            for i in range(len(lines)):
-                line = lines[i]
-                xOffset = 0
-                for j in range(len(line)):
-                    char = line[j]
-
-                    # render the character
-                    if char != ' ':
-                        color = self.colorMap[(i,j)] if (i,j) in self.colorMap else self.textColor
-                        charSurface = self.font.render(char, True, color)
-                        
-                        # center the character in its allocated space
-                        charX = xOffset + (self.charWidth - charSurface.get_width()) // 2
-                        charY = yOffset + (self.charHeight - charSurface.get_height()) // 2
-                        self.blit(charSurface, (charX, charY))
-                    xOffset += self.charWidth
-                yOffset += self.charHeight
+        yOffset = 0
+        for i in range(len(grid)):
+            line = grid[i]
+            xOffset = 0
+            for j in range(len(line)):
+                char = line[j]
+
+                # render the character
+                if char != ' ':
+                    color = self.colorMap[(i,j)] if (i,j) in self.colorMap else self.textColor
+                    charSurface = self.font.render(char, True, color)
+                    
+                    # center the character in its allocated space
+                    charX = xOffset + (self.charWidth - charSurface.get_width()) // 2
+                    charY = yOffset + (self.charHeight - charSurface.get_height()) // 2
+                    self.blit(charSurface, (charX, charY))
+                xOffset += self.charWidth
+            yOffset += self.charHeight
+
+class AsciiTerminal(AsciiCanvas):
+    '''displays an ascii game in a terminal using ANSI escape sequences
+    only the cells that changed since the last frame are written,
+    and each frame is sent with a single write'''
+
+    def __init__(self, size = None, stream = None, ticker = None):
+        '''AsciiTerminal((int, int), stream, AsciiTicker) -> AsciiTerminal
+        sets up the terminal display
+        size: the (cols, rows) of the terminal. defaults to the terminal's size
+        stream: where the escape sequences are written. defaults to sys.stdout
+        ticker animates the sprites. defaults to the shared ticker'''
+        if size == None:
+            size = tuple(shutil.get_terminal_size())
+
+        # mouse positions are given in cells
+        self.charWidth, self.charHeight = 1, 1
+        AsciiCanvas.__init__(self, size[1], size[0], ticker)
+        self.stream = stream if stream != None else sys.stdout
+        self.lastFrame = None
+        self.lastBgColor = None
+        self.lastColor = None
+        self.colorCodes = {}
+
+    def get_stream(self):
+        '''AsciiTerminal.get_stream() -> stream
+        returns the stream the terminal writes to'''
+        return self.stream
+
+    def _color_code(self, color, isBg = False):
+        '''AsciiTerminal._color_code(color, bool) -> str
+        returns the escape sequence for a text (or background) color'''
+        key = (tuple(color) if isinstance(color, list) else color, isBg)
+        code = self.colorCodes.get(key)
+        if code == None:
+            rgb = pygame.Color(color)
+            code = f"\x1b[{48 if isBg else 38};2;{rgb.r};{rgb.g};{rgb.b}m"
+            self.colorCodes[key] = code
+        return code
+
+    def redraw(self):
+        '''AsciiTerminal.redraw() -> None
+        makes the next update write every cell again'''
+        self.lastFrame = None
+
+    def close(self):
+        '''AsciiTerminal.close() -> None
+        resets the terminal colors and shows the cursor again'''
+        self.stream.write(f"\x1b[0m\x1b[{self.viewport[2] + 1};1H\x1b[?25h")
+        self.stream.flush()
+        self.lastFrame = None
+
+    def update(self):
+        '''AsciiTerminal.update() -> None
+        updates the game and writes the changed cells to the terminal'''
+        grid = self.compose()
+        rows, cols = self.viewport[2], self.viewport[3]
+        output = []
+
+        # start over with a cleared screen
+        if self.lastFrame == None or self.lastBgColor != self.bgColor or \
+                len(self.lastFrame) != rows or (rows and len(self.lastFrame[0]) != cols):
+            output.append("\x1b[0m\x1b[?25l" + self._color_code(self.bgColor, True) + "\x1b[2J")
+            self.lastFrame = [[(' ', None)] * cols for row in range(rows)]
+            self.lastBgColor = self.bgColor
+            self.lastColor = None
+
+        # the terminal keeps the text color from the last frame
+        cursor = None
+        currentColor = self.lastColor
+        for i in range(rows):
+            line = grid[i] if i < len(grid) else ()
+            lastLine = self.lastFrame[i]
+            for j in range(cols):
+                char = line[j] if j < len(line) else ' '
+                if char == ' ':
+                    cell = (' ', None)
+                else:
+                    cell = (char, self.colorMap.get((i, j), self.textColor))
+                if cell == lastLine[j]:
+                    continue
+                lastLine[j] = cell
+
+                # only move the cursor and change the color when needed
+                if cursor != (i, j):
+                    output.append(f"\x1b[{i + 1};{j + 1}H")
+                if cell[1] != None and cell[1] != currentColor:
+                    output.append(self._color_code(cell[1]))
+                    currentColor = cell[1]
+                output.append(char)
+                cursor = (i, j + 1)
+        self.lastColor = currentColor
+
+        if output:
+            self.stream.write("".join(output))
+            self.stream.flush()
 
 class AsciiSprite:
     '''creates a sprite-like object that you can display using AsciiWindow'''
@@ -340,10 +718,29 @@ class AsciiSprite:
     def get_current_frame(self):
         '''AsciiSprite.get_current_frame() -> str
         returns the current ascii art frame for the sprite'''
+        frame = self.get_compiled_frame()
+        if frame == None:
+            return ""
+        return frame.text
+
+    def get_compiled_frame(self):
+        '''AsciiSprite.get_compiled_frame() -> _AsciiFrame
+        returns the current compiled frame for the sprite
+        returns None if there is no frame bundle'''
         if self.currentRef:
-            frames, delay, index, clock, color = self.frameBundles[self.currentRef]
-            return frames[index]
-        return ""
+            frames = self.frameBundles[self.currentRef][0]
+            return frames[self.get_frame_index()]
+
+    def get_frame_index(self, ref = None):
+        '''AsciiSprite.get_frame_index(str) -> int
+        returns the current frame index of the bundle ref (defaults to the current bundle)'''
+        if ref == None:
+            ref = self.currentRef
+        frames, delay, index, startTick, color = self.frameBundles[ref]
+        if delay == None or ref != self.currentRef:
+            return index
+        ticks = self.window.get_ticker().get_ticks(delay)
+        return (index + ticks - startTick) % len(frames)
 
     def add_frame_bundle(self, ref, frames, delay = None, color = None):
         '''add_frame_bundle(str, str[], int, str) -> None
@@ -355,15 +752,14 @@ class AsciiSprite:
         a frame bundle is a series of ascii frames that can be animated
         each bundle consists of the list of frames (strings), the
         delay (in ms) between frames, and the current frame index
-        includes a gamesetup clock to track when to switch
+        the window's ticker keeps track of when to switch
         includes the color of the frame
-        they also have a reference id (ref) that's used to switch between them'''
+        they also have a reference id (ref) that's used to switch between them
+        the frames are compiled once here and shared with other sprites using the same frames'''
         # build the bundle
         if delay != None:
-            clock = gs.Clock(delay / 1000)
-        else:
-            clock = None
-        self.frameBundles[ref] = [frames, delay, 0, clock, color]
+            self.window.get_ticker().register(delay)
+        self.frameBundles[ref] = [_compile_frames(tuple(frames)), delay, 0, 0, color]
 
         # switch to this bundle if currentRef is None
         if not self.currentRef:
@@ -372,10 +768,13 @@ class AsciiSprite:
     def switch_frame_bundle(self, ref):
         '''AsciiSprite.switch_frame_bundle(str) -> None
         switches to the frame bundle using the reference id (ref)'''
-        clock = self.frameBundles[ref][3]
-        if clock != None:
-            clock.reset()
-            clock.start()
+        # save where the old bundle was
+        if self.currentRef and self.currentRef in self.frameBundles:
+            self.frameBundles[self.currentRef][2] = self.get_frame_index()
+
+        bundle = self.frameBundles[ref]
+        if bundle[1] != None:
+            bundle[3] = self.window.get_ticker().get_ticks(bundle[1])
         self.currentRef = ref
 
     def pos(self, position = None):
@@ -393,17 +792,8 @@ class AsciiSprite:
             return
 
         # get the frame bundle info
-        bundle = self.frameBundles[self.currentRef]
-        frames, delay, currentFrameIndex, clock, color = bundle
-        currentFrame = frames[currentFrameIndex]
-
-        # update the bundle
-        if delay != None and clock != None and clock.get_time() >= clock.get_max():
-            currentFrameIndex = (currentFrameIndex + 1) % len(frames)
-            bundle[2] = currentFrameIndex
-            currentFrame = frames[currentFrameIndex]
-            clock.reset()
-            clock.start()
+        color = self.frameBundles[self.currentRef][4]
+        currentFrame = self.get_compiled_frame()
 
         # display the frame
         self.window.draw(currentFrame, self.pos(), color)
@@ -12,11 +12,22 @@
 # WARNING: codes using older versions may not be
 # completely combatible with new versions
 
-import pygame, time, math, random
+import pygame, time, math, random, collections, os, multiprocessing, signal, traceback
+import gzip, marshal, struct
 
 global GAME_VERSION
 GAME_VERSION = "1.9.0"
 
+# the time, mouse position and pressed keys of the current frame
+# only set while a game is recording or replaying, so every read in a frame matches
+_frameTime = None
+_frameMousePos = None
+_frameKeys = None
+
+# every pygame keycode, recorded by checking each one in pygame.key.get_pressed()
+# keys like K_UP are above 0x40000000, so they can't be found by index
+_KEY_CODES = tuple(sorted({getattr(pygame, name) for name in dir(pygame) if name.startswith("K_")}))
+
 class GameSetupError(Exception):
     '''error for the gamesetup module'''
 
@@ -54,7 +65,7 @@ class Clock:
         '''Clock.get_time() -> float
         returns the current time on the stopwatch'''
         if self.startTime == None: return self.saved
-        currentTime = time.time()-self.startTime+self.saved
+        currentTime = now()-self.startTime+self.saved
         if self.maxTime != None and currentTime > self.maxTime:
             return self.maxTime
         return currentTime
@@ -88,7 +99,83 @@ class Clock:
         '''Clock.start() -> None
         starts the stopwatch.
         stopwatch may be stopped using Clock.stop()'''
-        self.startTime = time.time()
+        self.startTime = now()
+
+class LRUCache:
+    '''represents a cache with a maximum number of items
+    the least recently used item is thrown away when the cache is full'''
+
+    def __init__(self, maxSize=128):
+        '''LRUCache(int) -> LRUCache
+        constructs an empty cache that holds at most maxSize items
+        if maxSize is None, the cache never throws items away'''
+        self.maxSize = maxSize
+        self.items = collections.OrderedDict()
+
+    def __len__(self):
+        '''len(LRUCache) -> int
+        returns the number of items in the cache'''
+        return len(self.items)
+
+    def __contains__(self, key):
+        '''key in LRUCache -> bool
+        returns if key is in the cache'''
+        return key in self.items
+
+    def get(self, key, default=None):
+        '''LRUCache.get(key, default=None) -> value
+        returns the value for key and marks it as recently used
+        returns default if key isn't in the cache'''
+        if key not in self.items:
+            return default
+        self.items.move_to_end(key)
+        return self.items[key]
+
+    def set(self, key, value):
+        '''LRUCache.set(key, value) -> None
+        stores value for key, throwing away old items if the cache is full'''
+        self.items[key] = value
+        self.items.move_to_end(key)
+        self.trim()
+
+    def pop(self, key, default=None):
+        '''LRUCache.pop(key, default=None) -> value
+        removes key from the cache and returns its value'''
+        return self.items.pop(key, default)
+
+    def get_max(self):
+        '''LRUCache.get_max() -> int
+        returns the max number of items in the cache'''
+        return self.maxSize
+
+    def set_max(self, maxSize):
+        '''LRUCache.set_max(int) -> None
+        sets the max number of items in the cache'''
+        self.maxSize = maxSize
+        self.trim()
+
+    def trim(self):
+        '''LRUCache.trim() -> None
+        throws away the least recently used items until the cache fits'''
+        if self.maxSize == None: return
+        while len(self.items) > max(self.maxSize, 0):
+            self.items.popitem(last=False)
+
+    def clear(self):
+        '''LRUCache.clear() -> None
+        removes every item from the cache'''
+        self.items.clear()
+
+# font objects shared by every module, keyed by (name, size, bold, italic)
+_fontCache = LRUCache(64)
+
+# rotated surfaces, keyed by (id(source), angle, scale)
+# angles are rounded to the nearest _rotationStep degrees
+_rotationCache = LRUCache(512)
+_rotationStep = 1
+
+# hit masks, keyed by id(surface) like the rotation cache
+_maskCache = LRUCache(512)
 
 class Camera(pygame.Surface):
     '''Camera inherits from Surface
@@ -228,7 +315,7 @@ class Sprite(pygame.sprite.Sprite):
         if heading == None:
             return math.degrees(self.head)
         if self.imageTurning:
-            self.image = pygame.transform.rotozoom(self.tiltedImg, heading, 1)
+            self.image = rotate_surface(self.tiltedImg, heading)
         self.head = math.radians(heading)
         self.rect = self.image.get_rect()
         self.pos(self.pos())
@@ -238,7 +325,7 @@ class Sprite(pygame.sprite.Sprite):
         '''Sprite.tilt(heading) -> None
         tilts the image so that heading for image is 0 for sprite'''
         self.spriteImageTilt = heading
-        self.tiltedImg = pygame.transform.rotozoom(self.untiltedImg, heading, 1)
+        self.tiltedImg = rotate_surface(self.untiltedImg, heading)
         self.heading(self.heading())
 
     def towards(self, pos):
@@ -375,6 +462,9 @@ class Sprite(pygame.sprite.Sprite):
 class Widget(dict):
     '''represents a widget for in-module objects'''
 
+    # the attributes every widget has are slots, __dict__ keeps room for any others
+    __slots__ = ("id", "rect", "game", "events", "updateInMainloop", "z", "__dict__")
+
     def __init__(self, game, rect=(0,0,0,0), updateInMainloop = False, defaults={}, **attributes):
         '''Widget(game, rect, updateInMainloop = False, defaults, **attributes) -> Widget
         constructs the widget
@@ -393,6 +483,9 @@ class Widget(dict):
         self.events = {}
         self.updateInMainloop = updateInMainloop
 
+        # widgets that call mark_drawn get mouse clicks only when they are on top
+        self.z = None
+
     def __eq__(self, other):
         '''Widget == other -> bool
         returns if self is other'''
@@ -408,6 +501,11 @@ class Widget(dict):
         returns if the widget should be updated in the game mainloop'''
         return self.updateInMainloop
 
+    def set_update_status(self, status):
+        '''Widget.set_update_status(bool) -> None
+        sets if the widget should be updated in the game mainloop'''
+        self.updateInMainloop = status
+
     def get_clear_ID(self):
         '''Widget.ID() -> str
         returns a clear event ID'''
@@ -424,6 +522,18 @@ class Widget(dict):
         return self.rect[0] < pos[0] < self.rect[0]+self.rect[2] and \
             self.rect[1] < pos[1] < self.rect[1]+self.rect[3]
 
+    def get_z(self):
+        '''Widget.get_z() -> int
+        returns when the widget was last drawn, higher is closer to the top
+        returns None if the widget doesn't use z-ordering'''
+        return self.z
+
+    def mark_drawn(self):
+        '''Widget.mark_drawn() -> None
+        puts the widget on top of everything drawn before it this frame
+        call this when the widget is drawn, so mouse clicks only go to it when it's on top'''
+        self.z = self.game.next_z()
+
     def is_event(self, eventId):
         '''Widget.is_event(eventId) -> bool
         returns whether eventId is attached to an event'''
@@ -458,8 +568,8 @@ class Widget(dict):
 
     def set_focus_var(self, boolean):
         '''Widget.set_focus_var(boolean) -> None
-        simple setter for self.focus attribute'''
-        self.focus = boolean
+        sets whether the widget has the game's focus, same as Widget.focus(boolean)'''
+        self.focus(boolean)
 
     def focus(self, focus=None):
         '''Widget.focus(focus) -> None/bool
@@ -495,7 +605,7 @@ class Widget(dict):
                 perform.append(eventInfo[1])
 
             # on key press
-            elif eventInfo[0] == "onkeypress" and pygame.key.get_pressed()[eventInfo[2]] == 1:
+            elif eventInfo[0] == "onkeypress" and get_pressed_keys()[eventInfo[2]] == 1:
                 perform.append(eventInfo[1])
 
         for method in perform:
@@ -629,7 +739,7 @@ class TabBar(Widget):
         self.tabs = []
         self.current = None
         self.numTabs = 0
-        self["font"] = pygame.font.SysFont(*self["font"])
+        self["font"] = get_font(*self["font"])
 
     def __len__(self):
         '''len(TabBar) -> int
@@ -788,13 +898,13 @@ class Button(Widget):
                 
         # click img
         elif self.clicked and self["click"] != None:
-            if not self.is_over(pygame.mouse.get_pos()):
+            if not self.is_over(get_mouse_pos()):
                 self.clicked = False
             else:
                 img = self["click"]
                 
         # hover img
-        elif self.is_over(pygame.mouse.get_pos()) and self["hover"] != None:
+        elif self.is_over(get_mouse_pos()) and self["hover"] != None:
             img = self["hover"]
 
         if img == None:
@@ -961,6 +1071,70 @@ class _AfterEvent:
             self.eventList.remove(self)
             self.completed = True
 
+class Tween:
+    '''represents an animation run by the game every frame
+    step is called with the eased progress (0 to 1) each frame until the tween is done'''
+
+    def __init__(self, game, duration, step, ease="linear", onComplete=None, delay=0):
+        '''Tween(Game, float, function, str/function, function, float) -> Tween
+        constructs the tween and adds it to the game
+        duration and delay are in seconds
+        ease is the name of an easing curve (see get_easings) or a function from 0-1 to 0-1
+        onComplete is called once the tween reaches the end'''
+        if isinstance(ease, str):
+            if ease not in _EASINGS:
+                raise GameSetupError(f"Easing {ease} not in {list(_EASINGS)}")
+            ease = _EASINGS[ease]
+        self.game = game
+        self.duration = duration
+        self.delay = delay
+        self.step = step
+        self.ease = ease
+        self.onComplete = onComplete
+        self.clock = Clock()
+        self.clock.start()
+        self.running = True
+        game.add_tween(self)
+
+    def is_running(self):
+        '''Tween.is_running() -> bool
+        returns if the tween hasn't finished or been cancelled'''
+        return self.running
+
+    def get_progress(self):
+        '''Tween.get_progress() -> float
+        returns how far through the tween is, from 0 to 1, before easing'''
+        if self.duration <= 0:
+            return 1 if self.clock.get_time() >= self.delay else 0
+        return min(1, max(0, (self.clock.get_time() - self.delay) / self.duration))
+
+    def update(self):
+        '''Tween.update() -> None
+        moves the tween forward, finishing it once it reaches the end
+        Game.tick() calls this every frame'''
+        if not self.running or self.clock.get_time() < self.delay:
+            return
+        progress = self.get_progress()
+        if progress >= 1:
+            self.finish()
+        else:
+            self.step(self.ease(progress))
+
+    def finish(self):
+        '''Tween.finish() -> None
+        jumps to the end of the tween and calls onComplete'''
+        if not self.running:
+            return
+        self.running = False
+        self.step(self.ease(1))
+        if self.onComplete != None:
+            self.onComplete()
+
+    def cancel(self):
+        '''Tween.cancel() -> None
+        stops the tween where it is without calling onComplete'''
+        self.running = False
+
 class Sound(pygame.mixer.Sound):
     '''represents a sound object to be played, muted, unmuted'''
 
@@ -990,6 +1164,74 @@ class Sound(pygame.mixer.Sound):
         unmutes the sound'''
         pygame.mixer.Sound.set_volume(self, self.originVolume)
         
+class _InputLog:
+    '''private class for reading and writing recorded input
+    the log is gzipped binary: a header with the random seed and start time,
+    then one record per frame with the time, mouse position, pressed keys and events
+    pressed keys are stored as 32 bit keycodes'''
+
+    MAGIC = b"GSLOG2"
+
+    def __init__(self, path, mode):
+        '''_InputLog(path, "r" or "w") -> _InputLog
+        opens the log for reading or writing'''
+        self.file = gzip.open(path, mode + "b")
+
+    def write_header(self, seed, startTime):
+        '''_InputLog.write_header(int, float) -> None
+        writes the random seed and start time'''
+        self.file.write(self.MAGIC + struct.pack("<Qd", seed, startTime))
+
+    def read_header(self):
+        '''_InputLog.read_header() -> (seed, startTime)
+        reads the random seed and start time'''
+        if self.file.read(len(self.MAGIC)) != self.MAGIC:
+            raise GameSetupError("File is not a gamesetup input log.")
+        return struct.unpack("<Qd", self.file.read(16))
+
+    def write_frame(self, frameTime, mousePos, keys, events):
+        '''_InputLog.write_frame(float, (x,y), list, list) -> None
+        writes one frame. keys is a list of pressed keycodes'''
+        data = [struct.pack("<dhhHH", frameTime, mousePos[0], mousePos[1], len(keys), len(events))]
+        data.append(struct.pack(f"<{len(keys)}I", *keys))
+        for event in events:
+            attributes = marshal.dumps(_event_attributes(event))
+            data.append(struct.pack("<II", event.type, len(attributes)))
+            data.append(attributes)
+        self.file.write(b"".join(data))
+
+    def read_frame(self):
+        '''_InputLog.read_frame() -> (frameTime, mousePos, keys, events)
+        reads the next frame. returns None at the end of the log'''
+        header = self.file.read(16)
+        if len(header) < 16:
+            return None
+        frameTime, x, y, numKeys, numEvents = struct.unpack("<dhhHH", header)
+        keys = struct.unpack(f"<{numKeys}I", self.file.read(4 * numKeys))
+        events = []
+        for i in range(numEvents):
+            eventType, size = struct.unpack("<II", self.file.read(8))
+            events.append(pygame.event.Event(eventType, marshal.loads(self.file.read(size))))
+        return frameTime, (x, y), keys, events
+
+    def close(self):
+        '''_InputLog.close() -> None
+        closes the log'''
+        self.file.close()
+
+class _ReplayKeys:
+    '''private class that looks like pygame.key.get_pressed() for replayed keys'''
+
+    def __init__(self, keys):
+        '''_ReplayKeys(keys) -> _ReplayKeys
+        keys is a list of pressed keycodes'''
+        self.keys = frozenset(keys)
+
+    def __getitem__(self, key):
+        '''_ReplayKeys[key] -> bool
+        returns if key is pressed'''
+        return key in self.keys
+
 class Game:
     '''represents the game object
     intended to be inherited from. includes methods like after
@@ -1005,6 +1247,9 @@ class Game:
         self.restarting = False
         self.isGameRunning = True
         self._AfterEvents = []
+        self.tweens = []
+        self.zCounter = 0
+        self.frameZ = 0
         self.soundsList = []
         self.isGameMuted = False
         self.screen = None
@@ -1016,6 +1261,15 @@ class Game:
         self.disableFill = False
         self.fps = fps
 
+        # recording and replaying carry on if a game restarts by calling __init__ again
+        if not hasattr(self, "inputLog"):
+            self.headless = False
+            self.inputLog = None
+            self.isRecording = False
+            self.isReplaying = False
+            self.replayOffset = 0
+            self.frameTimings = []
+
         # setup screen
         pygame.display.set_caption(caption)
         self.display = pygame.display.set_mode(size)
@@ -1026,12 +1280,13 @@ class Game:
         self.fpsClock = Clock(1 / (fps + 2 * fps // 60))
         self.fpsClock.set_time(self.fpsClock.get_max())
         self.showFps = False
-        self.fpsDisplayFont = pygame.font.SysFont("Arial", 15)
+        self.currentFps = fps
+        self.fpsDisplayFont = get_font("Arial", 15)
         self.currentFrames = 0
 
         # set up default font
         # used primarily for testing
-        self.defaultFont = pygame.font.SysFont("Arial", 20, True)
+        self.defaultFont = get_font("Arial", 20, True)
 
     def focus(self, focus=None):
         '''Game.focus(focus=None) -> type
@@ -1093,7 +1348,7 @@ class Game:
         '''Game.set_default_font(str, int, bool, bool) -> None
         sets a new default font using font name, size, bol and italic
         bold and italic both default to False'''
-        self.defaultFont = pygame.font.SysFont(name, size, bold, italic)
+        self.defaultFont = get_font(name, size, bold, italic)
 
     def after(self, ms, command):
         '''Game.after(ms, command) -> time
@@ -1128,13 +1383,52 @@ class Game:
 
     def pause_all_clocks(self):
         '''Game.pause_all_clocks() -> None
-        pauses all registered clocks'''
+        pauses all registered clocks and running tweens'''
         for clock in self.gameClocks: clock.stop()
+        for tween in self.tweens: tween.clock.stop()
 
     def play_all_clocks(self):
         '''Game.play_all_clocks() -> None
-        plays all registered clocks'''
+        plays all registered clocks and running tweens'''
         for clock in self.gameClocks: clock.start()
+        for tween in self.tweens: tween.clock.start()
+
+    def next_z(self):
+        '''Game.next_z() -> int
+        returns a z value above every widget drawn so far'''
+        self.zCounter += 1
+        return self.zCounter
+
+    def pick(self, pos):
+        '''Game.pick((x,y)) -> Widget
+        returns the topmost widget drawn last frame that pos is over
+        only widgets that use z-ordering (see Widget.mark_drawn) can be picked
+        returns None if there isn't one'''
+        top = None
+        for widget in self.widgets.values():
+            if widget.z != None and widget.z > self.frameZ and (top is None or widget.z > top.z) \
+                    and widget.is_over(pos):
+                top = widget
+        return top
+
+    def tween(self, duration, step, ease="linear", onComplete=None, delay=0):
+        '''Game.tween(float, function, str/function, function, float) -> Tween
+        starts an animation that calls step with the eased progress (0 to 1) every frame
+        see Tween for the parameters'''
+        return Tween(self, duration, step, ease, onComplete, delay)
+
+    def add_tween(self, tween):
+        '''Game.add_tween(Tween) -> None
+        adds a tween to be run every frame until it is done'''
+        self.tweens.append(tween)
+
+    def update_tweens(self):
+        '''Game.update_tweens() -> None
+        moves every running tween forward and forgets the ones that are done
+        Game.tick() calls this every frame'''
+        for tween in self.tweens[:]:
+            tween.update()
+        self.tweens = [tween for tween in self.tweens if tween.is_running()]
 
     def pixels_per_sec(self, pixelsPerSec):
         '''Game.pixels_per_sec(int) -> float
@@ -1222,6 +1516,157 @@ class Game:
             textSurface = self.defaultFont.render(text, True, color)
         self.blit(textSurface, position, centerx, centery)
             
+    def get_result(self):
+        '''Game.get_result() -> object
+        returns the outcome of the game for run_sessions. This method is meant to be overridden'''
+        return None
+
+    def record(self, path, seed=None):
+        '''Game.record(path, seed=None) -> int
+        records every frame's events, mouse position, pressed keys and time to path
+        seeds random with seed (or a new seed) and returns the seed
+        use record_session to also record what happens while the game is built'''
+        startTime = now()
+        if seed == None:
+            seed = random.randrange(2**63)
+        random.seed(seed)
+        self.stop_input_log()
+        self.inputLog = _InputLog(path, "w")
+        self.inputLog.write_header(seed, startTime)
+        self.isRecording = True
+        return seed
+
+    def replay(self, path, headless=False):
+        '''Game.replay(path, headless=False) -> list
+        replays a log from Game.record frame by frame and returns how long each frame took
+        random is seeded the same way as the recording
+        if headless, frames run as fast as possible and nothing is shown on the display'''
+        replayStart = now()
+        self.stop_input_log()
+        self.inputLog = _InputLog(path, "r")
+        seed, startTime = self.inputLog.read_header()
+        random.seed(seed)
+        self.replayOffset = replayStart - startTime
+        self.isReplaying = True
+        self.headless = headless
+        self.frameTimings = []
+
+        if headless:
+            while self.isGameRunning and self.isReplaying:
+                self.tick()
+        else:
+            self.mainloop()
+        self.stop_input_log()
+        return self.frameTimings
+
+    def stop_input_log(self):
+        '''Game.stop_input_log() -> None
+        stops recording or replaying'''
+        if self.inputLog != None:
+            self.inputLog.close()
+        self.inputLog = None
+        self.isRecording = False
+        self.isReplaying = False
+        _set_frame_state(None, None, None)
+
+    def get_frame_timings(self):
+        '''Game.get_frame_timings() -> list
+        returns how long each frame took (in seconds) while recording or replaying'''
+        return self.frameTimings
+
+    def get_frame_events(self):
+        '''Game.get_frame_events() -> list
+        returns the events for this frame. when replaying, they come from the log
+        when recording, they are written to the log'''
+        if self.isReplaying:
+            # live events are thrown away, but the window can still be closed
+            for event in pygame.event.get(pygame.QUIT):
+                self.close()
+
+            frame = self.inputLog.read_frame()
+            if frame == None:
+                self.stop_input_log()
+                self.close()
+                return []
+            frameTime, mousePos, keys, events = frame
+            _set_frame_state(frameTime + self.replayOffset, mousePos, _ReplayKeys(keys))
+            return events
+
+        events = pygame.event.get()
+        if self.isRecording:
+            frameTime = time.time()
+            mousePos = pygame.mouse.get_pos()
+            keys = pygame.key.get_pressed()
+            self.inputLog.write_frame(frameTime, mousePos,
+                [key for key in _KEY_CODES if keys[key]], events)
+            _set_frame_state(frameTime, mousePos, keys)
+        return events
+
+    def tick(self):
+        '''Game.tick() -> None
+        runs one frame of the game without waiting for the fps
+        Game.mainloop() calls this once per frame'''
+        frameStart = time.perf_counter()
+        events = self.get_frame_events()
+
+        # check all after events
+        for event in self._AfterEvents[:]:
+            event.check()
+
+        # move every running animation forward
+        if len(self.tweens) > 0:
+            self.update_tweens()
+
+        # other events
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.close()
+
+            # mouse buttons only go to the topmost z-ordered widget
+            isClick = event.type == pygame.MOUSEBUTTONDOWN or event.type == pygame.MOUSEBUTTONUP
+            if isClick:
+                target = self.pick(event.pos)
+
+            # process event in widgets
+            for widget in self.widgets.values():
+                if isClick and widget.z != None and widget is not target:
+                    continue
+                widget.process_event(event)
+
+            # process event for bindings
+            for binding in self.bindings:
+                if event.type == self.bindings[binding][0]:
+                    try:
+                        self.bindings[binding][1](event)
+                    except TypeError:
+                        self.bindings[binding][1]()
+                
+            self.event(event)
+
+        # widgets drawn from here on are the ones that can be picked next frame
+        self.frameZ = self.zCounter
+
+        if not self.disableFill:
+            self.screen.fill(self.bgColor)
+
+        # update widgets that have updateInMainloop set to True
+        for widget in self.widgets:
+            if self.widgets[widget].get_update_status():
+                self.widgets[widget].update()
+
+        if self.showFps:
+            self.write(f"{round(self.currentFps)} fps", (2,2), "light grey", font=self.fpsDisplayFont)
+        self.update()
+        if not self.headless:
+            self.display.blit(self.screen, (0,0))
+            pygame.display.update()
+        self.currentFrames += 1
+
+        # frames only have a fixed time while recording or replaying
+        if self.isRecording or self.isReplaying:
+            self.frameTimings.append(time.perf_counter() - frameStart)
+            _set_frame_state(None, None, None)
+            
     def mainloop(self):
         '''Game.mainloop() -> None
         starts the mainloop for the game'''
@@ -1229,7 +1674,7 @@ class Game:
         gameClock = Clock(5)
         gameClock.start()
         self.fpsClock.start()
-        currentFps = self.fps
+        self.currentFps = self.fps
 
         # the full mainloop
         while self.isGameRunning:
@@ -1241,45 +1686,9 @@ class Game:
 
             # calculate fps
             if gameClock.get_time() > 1:
-                currentFps = self.currentFrames / gameClock.get_time()
-
-            # check all after events
-            for event in self._AfterEvents[:]:
-                event.check()
-
-            # other events
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.close()
-
-                # process event in widgets
-                for widget in self.widgets:
-                    self.widgets[widget].process_event(event)
-
-                # process event for bindings
-                for binding in self.bindings:
-                    if event.type == self.bindings[binding][0]:
-                        try:
-                            self.bindings[binding][1](event)
-                        except TypeError:
-                            self.bindings[binding][1]()
-                    
-                self.event(event)
-
-            if not self.disableFill:
-                self.screen.fill(self.bgColor)
-
-            # update widgets that have updateInMainloop set to True
-            for widget in self.widgets:
-                if self.widgets[widget].get_update_status():
-                    self.widgets[widget].update()
-
-            if self.showFps:
-                self.write(f"{round(currentFps)} fps", (2,2), "light grey", font=self.fpsDisplayFont)
-            self.update()
-            self.display.blit(self.screen, (0,0))
-            pygame.display.update()
-            self.currentFrames += 1
+                self.currentFps = self.currentFrames / gameClock.get_time()
+
+            self.tick()
 
             # reset frames and game clock after the max time runs out
             # this allows the fps to be measured more accurately
@@ -1289,11 +1698,264 @@ class Game:
                 self.currentFrames = 0
 
         # quit or restart
+        self.stop_input_log()
+        clear_font_cache()
         pygame.quit()
         if self.restarting:
             pygame.init()
             self.__init__()
 
+def _ease_in(t):
+    '''_ease_in(float) -> float
+    starts slow and speeds up'''
+    return t * t * t
+
+def _ease_out(t):
+    '''_ease_out(float) -> float
+    starts fast and slows down'''
+    return 1 - (1 - t) ** 3
+
+def _ease_in_out(t):
+    '''_ease_in_out(float) -> float
+    starts slow, speeds up, then slows down'''
+    return 4 * t * t * t if t < 0.5 else 1 - (-2 * t + 2) ** 3 / 2
+
+# easing curves for tweens, each turns progress from 0-1 into eased progress
+_EASINGS = {
+    "linear": lambda t: t,
+    "in": _ease_in,
+    "out": _ease_out,
+    "in-out": _ease_in_out,
+}
+
+def get_easings():
+    '''get_easings() -> list
+    returns the names of the easing curves tweens can use'''
+    return list(_EASINGS)
+
+def lerp(start, end, amount):
+    '''lerp(float/(x,y), float/(x,y), float) -> float/(x,y)
+    returns the value amount (0 to 1) of the way from start to end
+    works on numbers and on tuples of numbers'''
+    if isinstance(start, (tuple, list)):
+        return tuple(a + (b - a) * amount for a, b in zip(start, end))
+    return start + (end - start) * amount
+
+def get_font(name, size, bold=False, italic=False):
+    '''get_font(str, int, bool, bool) -> pygame.font.Font
+    returns a system font, looking it up only the first time it is asked for
+    the font object is shared, so changing its style changes it everywhere'''
+    key = (name.lower().replace(" ", "") if isinstance(name, str) else name, size, bool(bold), bool(italic))
+    font = _fontCache.get(key)
+    if font == None:
+        font = pygame.font.SysFont(name, size, bold, italic)
+        _fontCache.set(key, font)
+    return font
+
+def clear_font_cache():
+    '''clear_font_cache() -> None
+    throws away every shared font
+    fonts stop working after pygame.quit, so this is done before quitting'''
+    _fontCache.clear()
+
+def set_font_cache_size(maxSize):
+    '''set_font_cache_size(int) -> None
+    sets the max number of fonts kept in the font cache'''
+    _fontCache.set_max(maxSize)
+
+def rotate_surface(surface, angle, scale=1):
+    '''rotate_surface(surface, float, float=1) -> Surface
+    returns surface rotated by angle and scaled by scale with pygame.transform.rotozoom
+    angle is rounded to the rotation step and results are cached,
+    so the returned surface is shared and shouldn't be drawn on'''
+    if _rotationStep:
+        angle = round(angle / _rotationStep) * _rotationStep % 360
+    key = (id(surface), angle, scale)
+
+    # the source is kept with the result so its id can't be reused while cached
+    cached = _rotationCache.get(key)
+    if cached != None and cached[0] is surface:
+        return cached[1]
+    rotated = pygame.transform.rotozoom(surface, angle, scale)
+    _rotationCache.set(key, (surface, rotated))
+    return rotated
+
+def clear_rotation_cache():
+    '''clear_rotation_cache() -> None
+    throws away every cached rotated surface'''
+    _rotationCache.clear()
+
+def set_rotation_cache_size(maxSize):
+    '''set_rotation_cache_size(int) -> None
+    sets the max number of rotated surfaces kept in the rotation cache'''
+    _rotationCache.set_max(maxSize)
+
+def get_rotation_step():
+    '''get_rotation_step() -> float
+    returns the step, in degrees, that rotations are rounded to'''
+    return _rotationStep
+
+def set_rotation_step(step):
+    '''set_rotation_step(float) -> None
+    sets the step, in degrees, that rotations are rounded to
+    a step of 0 or None uses exact angles'''
+    global _rotationStep
+    _rotationStep = step
+
+def get_mask(surface):
+    '''get_mask(surface) -> pygame.mask.Mask
+    returns a mask of the pixels in surface that can be seen
+    masks are cached, so surface shouldn't be drawn on after its mask is made'''
+    cached = _maskCache.get(id(surface))
+    if cached != None and cached[0] is surface:
+        return cached[1]
+    mask = pygame.mask.from_surface(surface)
+    _maskCache.set(id(surface), (surface, mask))
+    return mask
+
+def clear_mask_cache():
+    '''clear_mask_cache() -> None
+    throws away every cached mask'''
+    _maskCache.clear()
+
+def set_mask_cache_size(maxSize):
+    '''set_mask_cache_size(int) -> None
+    sets the max number of masks kept in the mask cache'''
+    _maskCache.set_max(maxSize)
+
+def now():
+    '''now() -> float
+    returns the current time in seconds
+    while a game is recording or replaying, this is the same for the whole frame'''
+    if _frameTime != None:
+        return _frameTime
+    return time.time()
+
+def get_mouse_pos():
+    '''get_mouse_pos() -> (x,y)
+    returns the mouse position (the recorded one while replaying)'''
+    if _frameMousePos != None:
+        return _frameMousePos
+    return pygame.mouse.get_pos()
+
+def get_pressed_keys():
+    '''get_pressed_keys() -> sequence
+    returns the pressed keys like pygame.key.get_pressed() (the recorded ones while replaying)'''
+    if _frameKeys != None:
+        return _frameKeys
+    return pygame.key.get_pressed()
+
+def _set_frame_state(frameTime, mousePos, keys):
+    '''_set_frame_state(float, (x,y), sequence) -> None
+    sets the time, mouse position and pressed keys for the frame (None uses the live ones)'''
+    global _frameTime, _frameMousePos, _frameKeys
+    _frameTime, _frameMousePos, _frameKeys = frameTime, mousePos, keys
+
+def _event_attributes(event):
+    '''_event_attributes(pygame.event.Event) -> dict
+    returns the attributes of event that can be saved in an input log'''
+    def savable(value):
+        if isinstance(value, (tuple, list)):
+            return all(savable(item) for item in value)
+        return value == None or isinstance(value, (bool, int, float, str))
+    return {key: value for key, value in event.dict.items() if savable(value)}
+
+def record_session(path, factory, seed=None):
+    '''record_session(path, factory, seed=None) -> int
+    seeds random, builds a game with factory() and plays it while recording to path
+    time is fixed while the game is built so replay_session can rebuild it the same way
+    returns the seed'''
+    if seed == None:
+        seed = random.randrange(2**63)
+    random.seed(seed)
+    _set_frame_state(time.time(), None, None)
+    try:
+        game = factory()
+        game.record(path, seed)
+    finally:
+        _set_frame_state(None, None, None)
+    game.mainloop()
+    return seed
+
+def replay_session(path, factory, headless=False):
+    '''replay_session(path, factory, headless=False) -> list
+    builds a game with factory() the same way record_session did and replays path
+    returns how long each frame took (in seconds)'''
+    log = _InputLog(path, "r")
+    seed, startTime = log.read_header()
+    log.close()
+
+    random.seed(seed)
+    _set_frame_state(startTime, None, None)
+    try:
+        game = factory()
+    finally:
+        _set_frame_state(None, None, None)
+
+    # keep time where it was when the game was built
+    _set_frame_state(startTime, None, None)
+    return game.replay(path, headless)
+
+def _init_session_worker():
+    '''_init_session_worker() -> None
+    sets up pygame once for a run_sessions worker process without a window or sound'''
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+
+    # SDL turns SIGTERM into a quit event, which would keep the pool from stopping the worker
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+def _run_session(job):
+    '''_run_session((int, factory, config, int)) -> dict
+    runs one headless game session in a worker process'''
+    index, factory, config, maxFrames = job
+    frames = 0
+    result = None
+    error = None
+    start = time.perf_counter()
+    try:
+        if isinstance(config, int):
+            random.seed(config)
+        game = factory(config)
+        game.headless = True
+        while game.isGameRunning and frames < maxFrames:
+            game.tick()
+            frames += 1
+        result = game.get_result()
+    except Exception:
+        error = traceback.format_exc()
+    return {"index": index, "config": config, "result": result, "frames": frames,
+        "time": time.perf_counter() - start, "error": error, "worker": os.getpid()}
+
+def run_sessions(factory, configs, maxFrames=10000, processes=None):
+    '''run_sessions(factory, list, int, int) -> generator
+    runs a headless game session for every config across a pool of processes
+    and yields a result dict for each session as soon as it finishes
+
+    factory(config) must return a Game and must be importable (a class or top level function)
+    if config is an int, it is also used to seed random before the session starts
+    a session runs until the game closes or maxFrames (defaults to 10000) frames have run,
+    so games that never close themselves still finish
+    processes defaults to the number of cores. workers are reused between sessions
+
+    each result dict has "index", "config", "result" (from Game.get_result()),
+    "frames", "time" (seconds), "error" (a traceback or None) and "worker"'''
+    if maxFrames == None or maxFrames < 1:
+        raise GameSetupError("maxFrames must be at least 1")
+    jobs = [(index, factory, config, maxFrames) for index, config in enumerate(configs)]
+    if processes == None:
+        processes = os.cpu_count() or 1
+    context = multiprocessing.get_context("spawn")
+    pool = context.Pool(min(processes, max(len(jobs), 1)), _init_session_worker)
+    try:
+        for result in pool.imap_unordered(_run_session, jobs):
+            yield result
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
 def distance(p1, p2):
     '''distance((x,y), (x,y)) -> float
     returns the distance between p1 and p2'''
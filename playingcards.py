@@ -6,12 +6,48 @@
 # Used with the pygame module
 # Also requires gamesetup 1.9.5
 
-import pygame, time, random, math
+import pygame, time, random, math, os, sys, json, hashlib, collections
 import gamesetup as gs
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 global GAME_VERSION
 GAME_VERSION = "1.0.1"
 
+# info for faces, suits, and the fonts used to draw them
+_CARD_FACES = ("A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "JOKER", "EMPTY")
+_SUIT_SYMBOLS = {"spade": "♠", "heart": "♥", "club": "♣", "diamond": "♦", "JOKER": "♪"}
+_CARD_FONT = "segoeprint"
+_FONT_SIZES = {"tiny": 21, "small": 18, "medium":  18, "large": 22}
+_JOKER_FONT_SIZES = {"tiny": 11, "small": 16, "medium": 24, "large": 36}
+_FACE_FONT_SIZES = {"tiny": 0, "small": 0, "medium": 50, "large": 85}
+_CENTER_FONT_SIZES = {"tiny": 0, "small": 0, "medium": 40, "large": 50}
+
+# card codes used by encode_card
+_FACE_INDEXES = {"A": 0, "2": 1, "3": 2, "4": 3, "5": 4, "6": 5, "7": 6, "8": 7, "9": 8, "10": 9, "J": 10, "Q": 11, "K": 12}
+_SUIT_INDEXES = {"heart": 0, "spade": 1, "diamond": 2, "club": 3}
+_SUIT_COLORS = ("red", "black", "red", "black")
+_JOKER_COLORS = ("red", "black")
+
+# poker hand tables, loaded by _get_poker_tables the first time a hand is scored
+_HAND_NAMES = ("high card", "pair", "two pair", "three of a kind", "straight",
+    "flush", "full house", "four of a kind", "straight flush")
+_pokerTables = None
+_POKER_BUCKET_BITS = 15
+_POKER_SLOT_BITS = 17
+
+# rendered sides shared by every card with the same look
+_renderCache = gs.LRUCache(512)
+
+# sprite sheets of rendered sides saved between runs
+# atlases are only used after enable_card_atlas is called
+_atlasDir = None
+_atlases = {}
+_ATLAS_COLUMNS = 11
+
 def _draw_diamond_for_back_design(surface, color, x, y, width, height):
     '''_draw_diamond_for_back_design(
         pygame.Surface, (r,g,b), x, y,
@@ -129,9 +165,539 @@ def _draw_card_numbered_suit_layout(surface, face, suit, flippedSuit, width, hei
             gs.blit(surface, suitPos[0], suitPos[1], True, True)
     
     
+def _build_card_face(face, suit, color, size, outlineColor, outlineWidth, font = _CARD_FONT):
+    '''_build_card_face(str, str, color, str, (r,g,b), int, str) -> pygame.Surface
+    returns a new surface with a card's face'''
+    width, height = get_sizes()[size]
+
+    # create the pygame surface
+    front = pygame.Surface((width,height))
+    front.fill("white")
+    fullFront = pygame.Surface((width + outlineWidth*2, height + outlineWidth*2))
+    fullFront.fill(outlineColor)
+    transparentFront = pygame.Surface(
+        (width + outlineWidth*2, height + outlineWidth*2), pygame.SRCALPHA)
+
+    # the face of the card
+    if face != "JOKER":
+        faceText = gs.get_font(
+            font, _FONT_SIZES[size], True
+        ).render(face, True, color)
+        flippedFace = pygame.transform.flip(faceText, True, True)
+
+    # the face if the card is a joker
+    else:
+        jokerFont = gs.get_font(
+            font, _JOKER_FONT_SIZES[size], True
+        )
+
+        # create each letter individually
+        jokerSize = [0,0]
+        letters = []
+        for i in range(len(face)):
+            newLetter = jokerFont.render(face[i], True, color)
+            letters.append(newLetter)
+            jokerSize[0] += newLetter.get_width() / 2 if i != len(face) - 1 else newLetter.get_width()
+            jokerSize[1] += newLetter.get_height() * 0.6
+
+        # add each letter to a new surface
+        y = -0.2 * letters[0].get_height()
+        x = 0
+        faceText = pygame.Surface(jokerSize)
+        faceText.fill("white")
+        for letter in letters:
+            faceText.blit(letter, (x, y))
+            x += letter.get_width() / 2
+            y += letter.get_height() * 0.6
+
+        flippedFace = pygame.transform.flip(faceText, True, True)
+
+    # the suit of the card
+    suitText = gs.get_font(
+        font, _FONT_SIZES[size] + 10, True
+    ).render(_SUIT_SYMBOLS[suit], True, color)
+    flippedSuit = pygame.transform.flip(suitText, True, True)
+
+    # the center of the card
+    if face.isalpha() and face != "A":
+        center = gs.get_font(
+            font, _FACE_FONT_SIZES[size], True
+        ).render(face, True, color)
+    else:
+        center = gs.get_font(
+            font, _CENTER_FONT_SIZES[size], True
+        ).render(_SUIT_SYMBOLS[suit], True, color)
+    flippedCenter = pygame.transform.flip(center, True, True)
+
+    # leave the card empty
+    if face == "EMPTY":
+        pass
+
+    # build joker card
+    elif face == "JOKER":
+        gs.blit(front, faceText, (width / 2, height / 2), True, True)
+
+    # build tiny card
+    elif size == "tiny":
+        gs.blit(front, faceText, (width / 2, height / 2 - faceText.get_height() + 4), True, False)
+        gs.blit(front, suitText, (width / 2, height / 2 - 17), True, False)
+
+    # build small card
+    elif size == "small":
+        gs.blit(front, faceText, (7, 0))
+        gs.blit(front, flippedFace,
+            (width - flippedFace.get_width() - 7, height - flippedFace.get_height()))
+        gs.blit(front, suitText, (width / 2, height / 2), True, True)
+
+    # build medium cards
+    elif size == "medium":
+        gs.blit(front, faceText, (7, -3))
+        gs.blit(front, flippedFace,
+            (width - flippedFace.get_width() - 7, height - flippedFace.get_height() + 3))
+
+        # deal with number cards and aces
+        if face.isalpha() and face != "A":
+            gs.blit(front, suitText, (faceText.get_width() / 2 + 7, faceText.get_height() - 23), True, False)
+            gs.blit(front, flippedSuit,
+                (width - flippedFace.get_width() / 2 - 7, height - flippedFace.get_height() - flippedSuit.get_height() + 23),
+                True, False)
+
+        _draw_card_numbered_suit_layout(front, face, center, flippedCenter, width, height)
+
+    # build large cards
+    else:
+        gs.blit(front, faceText, (7, -3))
+        gs.blit(front, flippedFace,
+            (width - flippedFace.get_width() - 7, height - flippedFace.get_height() + 3))
+        gs.blit(front, suitText, (faceText.get_width() / 2 + (7 if face != "10" else 0), faceText.get_height() - 26), True, False)
+        gs.blit(front, flippedSuit,
+                (width - flippedFace.get_width() / 2 - (7 if face != "10" else 0), height - flippedFace.get_height() - flippedSuit.get_height() + 26),
+                True, False)
+
+        _draw_card_numbered_suit_layout(front, face, center, flippedCenter, width, height)
+
+    fullFront.blit(front, (outlineWidth, outlineWidth))
+    transparentFront.blit(fullFront, (0, 0))
+
+    return transparentFront
+
+def _build_card_back(size, backColor, outlineColor, outlineWidth):
+    '''_build_card_back(str, (r,g,b), (r,g,b), int) -> pygame.Surface
+    returns a new surface with a card's back'''
+    width, height = get_sizes()[size]
+
+    # the size of the diamond pattern
+    designWidth = 3
+    designHeight = 4
+    designSpacing = round(width / designWidth * 0.3)
+    diamondWidth = (width - designSpacing) / designWidth - designSpacing
+    diamondHeight = (height - designSpacing) / designHeight - designSpacing
+
+    # create the pygame surface
+    back = pygame.Surface((width,height))
+    back.fill("white")
+    fullBack = pygame.Surface((width + outlineWidth*2, height + outlineWidth*2))
+    fullBack.fill(outlineColor)
+    transparentBack = pygame.Surface(
+        (width + outlineWidth*2, height + outlineWidth*2), pygame.SRCALPHA)
+
+    # draw the outer diamond pattern
+    x, y = diamondWidth / 2 + designSpacing, diamondHeight / 2 + designSpacing
+    for row in range(designHeight):
+        for col in range(designWidth):
+            _draw_diamond_for_back_design(
+                back, backColor, int(x), int(y),
+                diamondWidth, diamondHeight)
+            x += diamondWidth + designSpacing
+        x = diamondWidth / 2 + designSpacing
+        y += diamondHeight + designSpacing
+
+    # draw the inner diamond pattern
+    designWidth += 1
+    designHeight += 1
+    x, y = 0.5 * designSpacing, 0.5 * designSpacing
+    for row in range(designHeight):
+        for col in range(designWidth):
+            _draw_diamond_for_back_design(
+                back, backColor, int(x), int(y),
+                diamondWidth, diamondHeight)
+            x += diamondWidth + designSpacing
+        x = 0.5 * designSpacing
+        y += diamondHeight + designSpacing
+
+    fullBack.blit(back, (outlineWidth, outlineWidth))
+    transparentBack.blit(fullBack, (0, 0))
+
+    return transparentBack
+
+def _color_key(color):
+    '''_color_key(color) -> hashable
+    returns a version of color that can be used in a cache key'''
+    if isinstance(color, str):
+        return color
+    return tuple(color)
+
+def get_card_face(face, suit, color, size = "medium", outlineColor = (50,50,50), outlineWidth = 2, font = _CARD_FONT):
+    '''get_card_face(str, str, color, str, (r,g,b), int, str) -> pygame.Surface
+    returns the rendered face for a card, built once and then shared
+    the surface is shared by every card that looks the same, so don't draw on it'''
+    key = ("face", face, suit, _color_key(color), size, _color_key(outlineColor), outlineWidth, font)
+    surface = _renderCache.get(key)
+    if surface == None:
+        if _atlasDir != None:
+            surface = _get_atlas_side(("face", size), key[1:4], key[5:])
+        if surface == None:
+            surface = _build_card_face(face, suit, color, size, outlineColor, outlineWidth, font)
+        _renderCache.set(key, surface)
+    return surface
+
+def get_card_back(size = "medium", backColor = (21, 60, 129), outlineColor = (50,50,50), outlineWidth = 2):
+    '''get_card_back(str, (r,g,b), (r,g,b), int) -> pygame.Surface
+    returns the rendered back for a card, built once and then shared
+    the surface is shared by every card that looks the same, so don't draw on it'''
+    key = ("back", size, _color_key(backColor), _color_key(outlineColor), outlineWidth)
+    surface = _renderCache.get(key)
+    if surface == None:
+        if _atlasDir != None:
+            surface = _get_atlas_side(key[:2], (), key[2:])
+        if surface == None:
+            surface = _build_card_back(size, backColor, outlineColor, outlineWidth)
+        _renderCache.set(key, surface)
+    return surface
+
+def clear_render_cache():
+    '''clear_render_cache() -> None
+    throws away every shared card side'''
+    _renderCache.clear()
+    _atlases.clear()
+
+def get_render_cache_size():
+    '''get_render_cache_size() -> int
+    returns the max number of card sides kept in the render cache'''
+    return _renderCache.get_max()
+
+def set_render_cache_size(maxSize):
+    '''set_render_cache_size(int) -> None
+    sets the max number of card sides kept in the render cache
+    if maxSize is None, card sides are never thrown away'''
+    _renderCache.set_max(maxSize)
+
+def _get_default_cache_dir():
+    '''_get_default_cache_dir() -> str
+    returns the playingcards folder in the user's cache directory'''
+    return os.path.join(
+        os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+        "playingcards")
+
+def enable_card_atlas(cacheDir = None):
+    '''enable_card_atlas(cacheDir = None) -> str
+    saves rendered card sides to sprite sheets in cacheDir and loads them on later runs
+    cacheDir defaults to a playingcards folder in the user's cache directory
+    returns the cache directory'''
+    global _atlasDir
+    if cacheDir == None:
+        cacheDir = _get_default_cache_dir()
+    _atlasDir = cacheDir
+    _atlases.clear()
+    return cacheDir
+
+def disable_card_atlas():
+    '''disable_card_atlas() -> None
+    stops using saved sprite sheets, card sides are rendered every run again'''
+    global _atlasDir
+    _atlasDir = None
+    _atlases.clear()
+
+def _get_atlas_side(style, entry, look):
+    '''_get_atlas_side(tuple, tuple, tuple) -> pygame.Surface
+    returns a side from the sprite sheet for style and look
+    style is ("face", size) or ("back", size), entry picks the side in the sheet
+    and look is the rest of the render parameters
+    returns None if the sheet doesn't have that side'''
+    atlasKey = style + look
+    if atlasKey not in _atlases:
+        _atlases[atlasKey] = _load_atlas(style, look)
+    return _atlases[atlasKey].get(entry)
+
+def _atlas_entries(style, look):
+    '''_atlas_entries(tuple, tuple) -> [(entry, pygame.Surface), ...]
+    renders every side that goes in the sprite sheet for style and look'''
+    kind, size = style
+    if kind == "back":
+        return [((), _build_card_back(size, *look))]
+
+    entries = []
+    for face, suit, color in get_deck(True, False) + [("EMPTY", "heart", "red")]:
+        entries.append(((face, suit, color),
+            _build_card_face(face, suit, color, size, *look)))
+    return entries
+
+def _load_atlas(style, look):
+    '''_load_atlas(tuple, tuple) -> dict
+    loads the sprite sheet for style and look from the cache directory,
+    building and saving it first if it isn't there
+    returns a dictionary of entry -> subsurface'''
+    kind, size = style
+
+    # the name depends on everything that changes how the sides look
+    fontFile = pygame.font.match_font(look[-1], True) if kind == "face" else None
+    name = hashlib.sha1(repr((style, look, GAME_VERSION, fontFile)).encode()).hexdigest()[:20]
+    imagePath = os.path.join(_atlasDir, f"{kind}-{size}-{name}.png")
+    indexPath = os.path.join(_atlasDir, f"{kind}-{size}-{name}.json")
+
+    # load the saved sheet
+    try:
+        with open(indexPath) as file:
+            index = json.load(file)
+        sheet = pygame.image.load(imagePath)
+        if pygame.display.get_surface() != None:
+            sheet = sheet.convert_alpha()
+        atlas = {}
+        for entry, rect in index["entries"]:
+            atlas[tuple(entry)] = sheet.subsurface(rect)
+        return atlas
+    except (OSError, ValueError, KeyError, TypeError, pygame.error):
+        pass
+
+    # build the sheet
+    entries = _atlas_entries(style, look)
+    width, height = entries[0][1].get_size()
+    columns = min(_ATLAS_COLUMNS, len(entries))
+    rows = math.ceil(len(entries) / columns)
+    sheet = pygame.Surface((width * columns, height * rows), pygame.SRCALPHA)
+    atlas = {}
+    index = {"version": GAME_VERSION, "entries": []}
+    for i in range(len(entries)):
+        entry, surface = entries[i]
+        rect = (i % columns * width, i // columns * height, width, height)
+        sheet.blit(surface, rect[:2])
+        atlas[entry] = sheet.subsurface(rect)
+        index["entries"].append([list(entry), rect])
+
+    # save it for the next run, writing to temporary files first so another
+    # process never reads half a sheet. the temporary names have the pid in them
+    # so processes building the same sheet at once don't write over each other
+    tempName = f".{os.getpid()}.tmp"
+    try:
+        os.makedirs(_atlasDir, exist_ok=True)
+        pygame.image.save(sheet, imagePath + tempName + ".png")
+        with open(indexPath + tempName, "w") as file:
+            json.dump(index, file)
+        os.replace(imagePath + tempName + ".png", imagePath)
+        os.replace(indexPath + tempName, indexPath)
+    except (OSError, pygame.error):
+        pass
+
+    return atlas
+
+class _CardPile(collections.deque):
+    '''private deque of cards that can also be used like a list
+    taking cards off either end is fast, and indexing, slicing, pop(index), +, sort
+    and comparing with lists work the way they did when piles were lists
+    onAdd and onRemove are called with each card that goes in or comes out of the pile'''
+
+    def __init__(self, cards = (), onAdd = None, onRemove = None):
+        '''_CardPile(cards = (), onAdd = None, onRemove = None) -> _CardPile
+        makes a pile of cards, onAdd is called for each of them'''
+        collections.deque.__init__(self, cards)
+        self.onAdd = onAdd
+        self.onRemove = onRemove
+        for card in self:
+            self._added(card)
+
+    def _added(self, card):
+        '''_CardPile._added(card) -> None
+        calls onAdd for a card that went into the pile'''
+        if self.onAdd != None:
+            self.onAdd(card)
+
+    def _removed(self, card):
+        '''_CardPile._removed(card) -> None
+        calls onRemove for a card that came out of the pile'''
+        if self.onRemove != None:
+            self.onRemove(card)
+
+    def _replace_all(self, cards):
+        '''_CardPile._replace_all(list) -> None
+        swaps in a new list of cards without calling onAdd or onRemove'''
+        collections.deque.clear(self)
+        collections.deque.extend(self, cards)
+
+    def __getitem__(self, index):
+        '''_CardPile[index] -> card or list
+        a slice returns a list of the cards'''
+        if isinstance(index, slice):
+            return list(self)[index]
+        return collections.deque.__getitem__(self, index)
+
+    def __setitem__(self, index, value):
+        '''_CardPile[index] = value -> None
+        a slice can be set to a list of cards like with a list'''
+        cards = list(self)
+        if isinstance(index, slice):
+            value = list(value)
+            removed, added = cards[index], value
+        else:
+            removed, added = [cards[index]], [value]
+        cards[index] = value
+        self._replace_all(cards)
+        for card in removed:
+            self._removed(card)
+        for card in added:
+            self._added(card)
+
+    def __delitem__(self, index):
+        '''del _CardPile[index] -> None
+        a slice of cards can be deleted like with a list'''
+        cards = list(self)
+        removed = cards[index] if isinstance(index, slice) else [cards[index]]
+        del cards[index]
+        self._replace_all(cards)
+        for card in removed:
+            self._removed(card)
+
+    def __add__(self, other):
+        '''_CardPile + cards -> list
+        returns a list of the pile's cards followed by other'''
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        '''cards + _CardPile -> list
+        returns a list of other followed by the pile's cards'''
+        return list(other) + list(self)
+
+    def __iadd__(self, other):
+        '''_CardPile += cards -> _CardPile
+        adds other to the end of the pile'''
+        self.extend(other)
+        return self
+
+    def __eq__(self, other):
+        '''_CardPile == other -> bool
+        returns if other is a pile or list with the same cards'''
+        if isinstance(other, list):
+            return list(self) == other
+        return collections.deque.__eq__(self, other)
+
+    def __ne__(self, other):
+        '''_CardPile != other -> bool
+        returns if other isn't a pile or list with the same cards'''
+        return not self == other
+
+    def append(self, card):
+        '''_CardPile.append(card) -> None
+        adds card to the end of the pile'''
+        collections.deque.append(self, card)
+        self._added(card)
+
+    def appendleft(self, card):
+        '''_CardPile.appendleft(card) -> None
+        adds card to the start of the pile'''
+        collections.deque.appendleft(self, card)
+        self._added(card)
+
+    def extend(self, cards):
+        '''_CardPile.extend(cards) -> None
+        adds cards to the end of the pile'''
+        cards = list(cards)
+        collections.deque.extend(self, cards)
+        for card in cards:
+            self._added(card)
+
+    def extendleft(self, cards):
+        '''_CardPile.extendleft(cards) -> None
+        adds cards to the start of the pile one at a time, so they end up reversed'''
+        cards = list(cards)
+        collections.deque.extendleft(self, cards)
+        for card in cards:
+            self._added(card)
+
+    def insert(self, index, card):
+        '''_CardPile.insert(int, card) -> None
+        puts card in the pile before index'''
+        collections.deque.insert(self, index, card)
+        self._added(card)
+
+    def pop(self, index = -1):
+        '''_CardPile.pop(index = -1) -> card
+        removes and returns the card at index, the last card by default'''
+        if index == -1:
+            card = collections.deque.pop(self)
+        elif index == 0:
+            card = collections.deque.popleft(self)
+        else:
+            card = collections.deque.__getitem__(self, index)
+            collections.deque.__delitem__(self, index)
+        self._removed(card)
+        return card
+
+    def popleft(self):
+        '''_CardPile.popleft() -> card
+        removes and returns the first card'''
+        card = collections.deque.popleft(self)
+        self._removed(card)
+        return card
+
+    def remove(self, card):
+        '''_CardPile.remove(card) -> None
+        removes the first copy of card from the pile'''
+        collections.deque.remove(self, card)
+        self._removed(card)
+
+    def clear(self):
+        '''_CardPile.clear() -> None
+        removes every card from the pile'''
+        cards = list(self)
+        collections.deque.clear(self)
+        for card in cards:
+            self._removed(card)
+
+    def sort(self, key = None, reverse = False):
+        '''_CardPile.sort(key = None, reverse = False) -> None
+        sorts the pile in place like list.sort'''
+        self._replace_all(sorted(self, key = key, reverse = reverse))
+
+    def shuffle(self):
+        '''_CardPile.shuffle() -> None
+        shuffles the pile in place'''
+        cards = list(self)
+        random.shuffle(cards)
+        self._replace_all(cards)
+
+def _get_hand_positions(numCards, numHands, locations, spread):
+    '''_get_hand_positions(int, int, [(x,y), ...], (x,y)) -> [(x,y), ...]
+    returns where each card dealt around the table goes
+    card i goes to hand i % numHands, offset by spread for every card already in the hand'''
+    positions = []
+    for i in range(numCards):
+        hand, slot = i % numHands, i // numHands
+        positions.append((locations[hand][0] + spread[0] * slot, locations[hand][1] + spread[1] * slot))
+    return positions
+
+def _animate_deal(cards, positions, speed, staggerMs, flip):
+    '''_animate_deal(Card[], [(x,y), ...], int, int, bool) -> None
+    starts every card moving to its position, each staggerMs after the last
+    if flip is True, each card is flipped when it arrives'''
+    for i in range(len(cards)):
+        cards[i].move_to(positions[i], speed, cards[i].shake_flip if flip else None,
+            delay = i * staggerMs / 1000)
+
 class Card(gs.Widget):
     '''represents a single playing card'''
 
+    # info for colors, faces, suits and font sizes is the same for every card
+    faces = _CARD_FACES
+    suits = _SUIT_SYMBOLS
+    fontSizes = _FONT_SIZES
+    jokerFontSize = _JOKER_FONT_SIZES
+    faceFontSizes = _FACE_FONT_SIZES
+    centerFontSizes = _CENTER_FONT_SIZES
+
+    # cards are made by the hundred, so their own attributes are slots too
+    __slots__ = ("face", "suit", "color", "backColor", "size", "currentSide",
+        "faceSide", "backSide", "displayFace", "displayBack", "outlineWidth", "outlineColor",
+        "shakeTween", "shakeViolence", "shakeFlip", "position", "isMoving", "moveTween", "rotation", "font")
+
     def __init__(self, game, card = ("10", "heart", "red"), size = "medium",
             backColor = (21, 60, 129), outlineColor = (50,50,50), outlineWidth = 2):
         '''Card(gs.Game, (face, suit, color), size, backColor, outlineColor, outlineWidth) -> Card
@@ -142,22 +708,15 @@ class Card(gs.Widget):
         color: any color to display the cards
         size: either "tiny", "small", "medium", or "large"'''
 
-        # info for colors, faces, and suits
-        self.faces = ["A", "2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "JOKER", "EMPTY"]
-        self.suits = {"spade": "♠", "heart": "♥", "club": "♣", "diamond": "♦", "JOKER": "♪"}
-
         # check to see if a card is valid
         if not card[0] in self.faces:
             raise gs.GameSetupError(f"Face {card[0]} not valid for playing card")
         elif not card[1] in self.suits:
             raise gs.GameSetupError(f"Suit {card[1]} not valid for playing card")
         
-        # set up the card sizes        
-        self.size = size
-        self.sizes = get_sizes(outlineWidth)
-        
         # set up the gamesetup widget
-        gs.Widget.__init__(self, game, (0, 0, self.sizes[size][0], self.sizes[size][1]), True)
+        width, height = get_sizes(outlineWidth)[size]
+        gs.Widget.__init__(self, game, (0, 0, width, height), True)
         
         # card attributes
         self.game = game
@@ -167,52 +726,49 @@ class Card(gs.Widget):
         self.backColor = backColor
         self.size = size
         self.currentSide = "back"
-        self.sides = {}
+        self.faceSide = None
+        self.backSide = None
+        self.displayFace = None
+        self.displayBack = None
         self.outlineWidth = outlineWidth
         self.outlineColor = outlineColor
-        self.shakeClock = gs.Clock()
+        self.shakeTween = None
         self.shakeViolence = 1
+        self.shakeFlip = False
         self.position = 0,0
         self.isMoving = False
-        self.moveClock = gs.Clock()
+        self.moveTween = None
         self.rotation = 0
-        self.font = "segoeprint"
-
-        # font info for different sizes
-        self.fontSizes = {
-            "tiny": 21, "small": 18, "medium":  18, "large": 22
-        }
-        self.jokerFontSize = {
-            "tiny": 11, "small": 16, "medium": 24, "large": 36
-        }
-        self.faceFontSizes = {
-            "tiny": 0, "small": 0, "medium": 50, "large": 85
-        }
-        self.centerFontSizes = {
-            "tiny": 0, "small": 0, "medium": 40, "large": 50
-        }
-        
-        self.render_sides()
+        self.font = _CARD_FONT
+
+        # the card is centered on its position, the sides are built the first time they are shown
+        self.move(self.position)
 
     def __eq__(self, secondCard):
         '''Card.__eq__(Card) -> bool
         returns if the given card's id matches this card'''
-        return self.get_id() == secondCard.get_id()
+        return isinstance(secondCard, Card) and self.get_id() == secondCard.get_id()
 
     def __str__(self):
         '''str(Card) -> str
         return a string version of the card'''
         return f"{self.color} {self.face} of {self.suit}s"
 
+    @property
+    def sizes(self):
+        '''Card.sizes -> dict
+        the (width, height) of every card size for this card's outline width'''
+        return get_sizes(self.outlineWidth)
+
     def get_width(self):
         '''Card.get_width() -> int
         returns the width of the card'''
-        return self.sides[f"display-{self.currentSide}"].get_width()
+        return self.get_display_side().get_width()
 
     def get_height(self):
         '''Card.get_height() -> int
         returns the height of the card'''
-        return self.sides[f"display-{self.currentSide}"].get_height()
+        return self.get_display_side().get_height()
 
     def get_rect(self):
         '''Card.get_rect() -> (x,y,w,h)
@@ -220,25 +776,72 @@ class Card(gs.Widget):
         return gs.Widget.get_rect(self)[0], gs.Widget.get_rect(self)[1], \
             self.get_width(), self.get_height()
 
+    def is_over(self, pos):
+        '''Card.is_over(pos) -> bool
+        returns if pos is over a pixel of the card as it's drawn
+        rotated cards are checked exactly with the mask of the side being shown'''
+        side = self.get_display_side()
+        x, y = pos[0] - self.rect[0], pos[1] - self.rect[1]
+        if not (0 <= x < side.get_width() and 0 <= y < side.get_height()):
+            return False
+        return gs.get_mask(side).get_at((int(x), int(y))) == 1
+
     def render_sides(self, redraw=True):
         '''Card.render_sides(redraw=True) -> None
-        renders the sides of the cards
-        if redraw is False, only rotates the cards'''
+        throws away the built sides of the card so they are built again when shown
+        if redraw is False, only the rotated sides are thrown away
+        the card keeps its center when the new sides are a different size'''
+        center = self.rect[0] + self.rect[2] / 2, self.rect[1] + self.rect[3] / 2
         if redraw:
-            self.sides["face"] = self.build_face()
-            self.sides["back"] = self.build_back()
-
-        # now rotate the cards
+            self.faceSide = None
+            self.backSide = None
+        self.displayFace = None
+        self.displayBack = None
+
+        self.set_rect(self.get_rect())
+        self.move(center)
+
+    def get_side(self, side):
+        '''Card.get_side("face" or "back") -> pygame.Surface
+        returns the unrotated surface for a side
+        the side is built the first time it is asked for'''
+        if side == "face":
+            if self.faceSide is None:
+                self.faceSide = get_card_face(self.face, self.suit, self.color,
+                    self.size, self.outlineColor, self.outlineWidth, self.font)
+            return self.faceSide
+        if self.backSide is None:
+            self.backSide = get_card_back(self.size, self.backColor,
+                self.outlineColor, self.outlineWidth)
+        return self.backSide
+
+    def get_display_side(self, side = None):
+        '''Card.get_display_side(side = None) -> pygame.Surface
+        returns the rotated surface for a side ("face" or "back")
+        uses the current side if side is not given'''
+        if side == None:
+            side = self.currentSide
+
+        if side == "face":
+            if self.displayFace is None:
+                self.displayFace = self._build_display_side("face")
+            return self.displayFace
+        if self.displayBack is None:
+            self.displayBack = self._build_display_side("back")
+        return self.displayBack
+
+    def _build_display_side(self, side):
+        '''Card._build_display_side("face" or "back") -> pygame.Surface
+        returns the side turned by the card's rotation'''
         if self.rotation != 0:
-            self.sides["display-face"] = pygame.transform.rotozoom(
-                self.sides["face"], self.rotation, 1)
-            self.sides["display-back"] = pygame.transform.rotozoom(
-                self.sides["back"], self.rotation, 1)
-        else:
-            self.sides["display-face"] = self.sides["face"]
-            self.sides["display-back"] = self.sides["back"]
-
-        self.set_rect(self.get_rect())        
+            return gs.rotate_surface(self.get_side(side), self.rotation)
+        return self.get_side(side)
+
+    def prewarm(self):
+        '''Card.prewarm() -> None
+        builds both sides of the card now instead of when they are first shown'''
+        self.get_display_side("face")
+        self.get_display_side("back")
         
     def get_suit(self):
         '''Card.get_suit() -> str
@@ -273,6 +876,22 @@ class Card(gs.Widget):
         self.suit = face
         self.render_sides()
 
+    def set_card(self, card):
+        '''Card.set_card((face, suit, color)) -> None
+        turns this card into a different card, keeping its size and colors
+        used to reuse card widgets instead of building new ones'''
+        if not card[0] in self.faces:
+            raise gs.GameSetupError(f"Face {card[0]} not valid for playing card")
+        elif not card[1] in self.suits:
+            raise gs.GameSetupError(f"Suit {card[1]} not valid for playing card")
+        self.face, self.suit, self.color = card
+        self.render_sides()
+
+    def get_card(self):
+        '''Card.get_card() -> (face, suit, color)
+        returns the card tuple for this card'''
+        return self.face, self.suit, self.color
+
     def get_back_color(self):
         '''Card.get_back_color() -> color
         returns the color of the back of the card'''
@@ -339,8 +958,11 @@ class Card(gs.Widget):
         '''Card.get_sides() -> dict
         returns both sides of the card in a dictionary
         "face" is the key to the face
-        "back" is the key to the back'''
-        return self.sides
+        "back" is the key to the back
+        "display-face" and "display-back" are the rotated sides'''
+        self.prewarm()
+        return {"face": self.faceSide, "back": self.backSide,
+            "display-face": self.displayFace, "display-back": self.displayBack}
 
     def flip_card(self, setSide = None):
         '''Card.flip_card(setSide = None) -> "face" or "back"
@@ -367,242 +989,110 @@ class Card(gs.Widget):
         self.rotation = degrees
         self.render_sides(False)
 
-    def shake(self, duration, violence = 1):
-        '''Card.shake(duration, violence = 1) -> None
+    def shake(self, duration, violence = 1, onComplete = None):
+        '''Card.shake(duration, violence = 1, onComplete = None) -> None
         causes the card to perform a shake animation
         duration is in seconds
-        smallest shake violence is 1'''
-        self.shakeClock.set_max(duration)
+        smallest shake violence is 1
+        onComplete is called when the shake is over'''
+        if self.shakeTween != None:
+            self.shakeTween.cancel()
         self.shakeViolence = violence
-        self.shakeClock.start()
+        self.shakeFlip = False
+        self.shakeTween = self.game.tween(duration, self._shake_step, onComplete = onComplete)
+
+    def _shake_step(self, progress):
+        '''Card._shake_step(float) -> None
+        moves the card a little each frame of a shake and puts it back at the end
+        flips the card once the shake is halfway if it was started by shake_flip'''
+        if self.shakeFlip and progress >= 0.5:
+            self.shakeFlip = False
+            self.flip_card()
+        if self.isMoving:
+            return
+        if progress >= 1:
+            self.pos(self.position)
+        else:
+            self.move((
+                self.position[0] + random.randint(-self.shakeViolence, self.shakeViolence),
+                self.position[1] + random.randint(-self.shakeViolence, self.shakeViolence),
+            ))
 
-    def shake_flip(self, duration = 0.07, violence = 2):
-        '''Card.shake_flip(durection = 0.07, violence = 2) -> None
-        performs a quick shake before the flip for a better look'''
-        self.shake(duration, violence)
-        self.game.after(duration / 2 * 1000, lambda: self.flip_card())
+    def shake_flip(self, duration = 0.07, violence = 2, onComplete = None):
+        '''Card.shake_flip(durection = 0.07, violence = 2, onComplete = None) -> None
+        performs a quick shake before the flip for a better look
+        the card flips halfway through the shake'''
+        self.shake(duration, violence, onComplete)
+        self.shakeFlip = True
 
     def _event_flip(self, event):
         '''Card._event_flip(event) -> None
         flips the cards. used for testing'''
         self.shake_flip()
 
-    def move_to(self, dest, speed):
-        '''Card.move_to(dest, speed) -> int
+    def move_to(self, dest, speed, onComplete = None, ease = "linear", delay = 0):
+        '''Card.move_to(dest, speed, onComplete = None, ease = "linear", delay = 0) -> int
         moves the card to destination (dest)
-        speed is in pixels/second
+        speed is in pixels/second, delay is in seconds before the card starts moving
+        ease is an easing curve from gs.get_easings()
+        onComplete is called when the card gets there
         returns the time it will take to move in milliseconds'''
-        distance = math.sqrt((self.position[0] - dest[0])**2 + (self.position[1] - dest[1])**2)
+        if self.moveTween != None:
+            self.moveTween.cancel()
+
+        start = self.position
+        distance = math.sqrt((start[0] - dest[0])**2 + (start[1] - dest[1])**2)
+        duration = distance / speed
         self.isMoving = distance > 0
-        self.moveClock.set_max(distance / speed)
-        self.moveDest = dest
-        self.moveClock.start()
-        return round(distance / speed * 1000) + 10
+
+        def finish_move():
+            self.isMoving = False
+            self.pos(dest)
+            if onComplete != None:
+                onComplete()
+
+        self.moveTween = self.game.tween(duration,
+            lambda progress: self.move(gs.lerp(start, dest, progress)), ease, finish_move, delay)
+        return round((delay + duration) * 1000) + 10
 
     def stop_moving(self):
         '''Card.stop_moving() -> None
         if the card is currently moving, stop it'''
+        if self.moveTween != None:
+            self.moveTween.cancel()
         self.isMoving = False
         self.pos((self.get_rect()[0], self.get_rect()[1]))
 
+    def stop_animations(self):
+        '''Card.stop_animations() -> None
+        stops any move or shake and puts the card back where it was resting'''
+        for tween in (self.moveTween, self.shakeTween):
+            if tween != None:
+                tween.cancel()
+        self.isMoving = False
+        self.pos(self.position)
+
     def build_face(self):
         '''Card.build_face() -> pygame.Surface
         returns a new surface with the card's face'''
-        width = gs.Widget.get_rect(self)[2] - self.outlineWidth*2
-        height = gs.Widget.get_rect(self)[3] - self.outlineWidth*2
-
-        # create the pygame surface
-        front = pygame.Surface((width,height))
-        front.fill("white")
-        fullFront = pygame.Surface((width + self.outlineWidth*2, height + self.outlineWidth*2))
-        fullFront.fill(self.outlineColor)
-        transparentFront = pygame.Surface(
-            (width + self.outlineWidth*2, height + self.outlineWidth*2), pygame.SRCALPHA)
-
-        # the face of the card
-        if self.face != "JOKER":
-            face = pygame.font.SysFont(
-                self.font, self.fontSizes[self.size], True
-            ).render(self.face, True, self.color)
-            flippedFace = pygame.transform.flip(face, True, True)
-
-        # the face if the card is a joker
-        else:
-            jokerFont = pygame.font.SysFont(
-                self.font, self.jokerFontSize[self.size], True
-            )
-
-            # create each letter individually
-            size = [0,0]
-            letters = []
-            for i in range(len(self.face)):
-                newLetter = jokerFont.render(self.face[i], True, self.color)
-                letters.append(newLetter)
-                size[0] += newLetter.get_width() / 2 if i != len(self.face) - 1 else newLetter.get_width()
-                size[1] += newLetter.get_height() * 0.6
-
-            # add each letter to a new surface
-            y = -0.2 * letters[0].get_height()
-            x = 0
-            face = pygame.Surface(size)
-            face.fill("white")
-            for letter in letters:
-                face.blit(letter, (x, y))
-                x += letter.get_width() / 2
-                y += letter.get_height() * 0.6
-
-            flippedFace = pygame.transform.flip(face, True, True)
-
-        # the suit of the card        
-        suit = pygame.font.SysFont(
-            self.font, self.fontSizes[self.size] + 10, True
-        ).render(self.suits[self.suit], True, self.color)
-        flippedSuit = pygame.transform.flip(suit, True, True)
-
-        # the center of the card
-        if self.face.isalpha() and self.face != "A":
-            center = pygame.font.SysFont(
-                self.font, self.faceFontSizes[self.size], True
-            ).render(self.face, True, self.color)
-        else:
-            center = pygame.font.SysFont(
-                self.font, self.centerFontSizes[self.size], True
-            ).render(self.suits[self.suit], True, self.color)
-        flippedCenter = pygame.transform.flip(center, True, True)
-
-        # leave the card empty
-        if self.face == "EMPTY":
-            pass
-
-        # build joker card
-        elif self.face == "JOKER":
-            self.game.blit(face, (width / 2, height / 2), True, True, front)
-
-        # build tiny card
-        elif self.size == "tiny":
-            self.game.blit(face, (width / 2, height / 2 - face.get_height() + 4),
-                True, False, front)
-            self.game.blit(suit, (width / 2, height / 2 - 17),
-                True, False, front)
-
-        # build small card
-        elif self.size == "small":
-            self.game.blit(face, (7, 0), False, False, front)
-            self.game.blit(flippedFace,
-                (width - flippedFace.get_width() - 7, height - flippedFace.get_height()),
-                False, False, front)
-            self.game.blit(suit, (width / 2, height / 2), True, True, front)
-
-        # build medium cards
-        elif self.size == "medium":
-            self.game.blit(face, (7, -3), False, False, front)
-            self.game.blit(flippedFace,
-                (width - flippedFace.get_width() - 7, height - flippedFace.get_height() + 3),
-                False, False, front)
-
-            # deal with number cards and aces
-            if self.face.isalpha() and self.face != "A":
-                self.game.blit(suit, (face.get_width() / 2 + 7, face.get_height() - 23), True, False, front)
-                self.game.blit(flippedSuit,
-                    (width - flippedFace.get_width() / 2 - 7, height - flippedFace.get_height() - flippedSuit.get_height() + 23),
-                    True, False, front)
-
-            _draw_card_numbered_suit_layout(front, self.face, center, flippedCenter, width, height)
-                
-        # build large cards
-        else:
-            self.game.blit(face, (7, -3), False, False, front)
-            self.game.blit(flippedFace,
-                (width - flippedFace.get_width() - 7, height - flippedFace.get_height() + 3),
-                False, False, front)
-            self.game.blit(suit, (face.get_width() / 2 + (7 if self.face != "10" else 0), face.get_height() - 26), True, False, front)
-            self.game.blit(flippedSuit,
-                    (width - flippedFace.get_width() / 2 - (7 if self.face != "10" else 0), height - flippedFace.get_height() - flippedSuit.get_height() + 26),
-                    True, False, front)
-
-            _draw_card_numbered_suit_layout(front, self.face, center, flippedCenter, width, height)
-
-        fullFront.blit(front, (self.outlineWidth, self.outlineWidth))
-        transparentFront.blit(fullFront, (0, 0))
-
-        return transparentFront
+        return _build_card_face(self.face, self.suit, self.color,
+            self.size, self.outlineColor, self.outlineWidth, self.font)
     
     def build_back(self):
         '''Card.build_back() -> pygame.Surface
         returns a new surface with the card's back'''
-        width = gs.Widget.get_rect(self)[2] - self.outlineWidth*2
-        height = gs.Widget.get_rect(self)[3] - self.outlineWidth*2
-
-        # the size of the diamond pattern
-        designWidth = 3
-        designHeight = 4
-        designSpacing = round(width / designWidth * 0.3)
-        diamondWidth = (width - designSpacing) / designWidth - designSpacing
-        diamondHeight = (height - designSpacing) / designHeight - designSpacing
-
-        # create the pygame surface
-        back = pygame.Surface((width,height))
-        back.fill("white")
-        fullBack = pygame.Surface((width + self.outlineWidth*2, height + self.outlineWidth*2))
-        fullBack.fill(self.outlineColor)
-        transparentBack = pygame.Surface(
-            (width + self.outlineWidth*2, height + self.outlineWidth*2), pygame.SRCALPHA)
-
-        # draw the outer diamond pattern
-        x, y = diamondWidth / 2 + designSpacing, diamondHeight / 2 + designSpacing
-        for row in range(designHeight):
-            for col in range(designWidth):
-                _draw_diamond_for_back_design(
-                    back, self.backColor, int(x), int(y),
-                    diamondWidth, diamondHeight)
-                x += diamondWidth + designSpacing
-            x = diamondWidth / 2 + designSpacing
-            y += diamondHeight + designSpacing
-
-        # draw the inner diamond pattern
-        designWidth += 1
-        designHeight += 1
-        x, y = 0.5 * designSpacing, 0.5 * designSpacing
-        for row in range(designHeight):
-            for col in range(designWidth):
-                _draw_diamond_for_back_design(
-                    back, self.backColor, int(x), int(y),
-                    diamondWidth, diamondHeight)
-                x += diamondWidth + designSpacing
-            x = 0.5 * designSpacing
-            y += diamondHeight + designSpacing
-
-        fullBack.blit(back, (self.outlineWidth, self.outlineWidth))
-        transparentBack.blit(fullBack, (0, 0))
-
-        return transparentBack
+        return _build_card_back(self.size, self.backColor,
+            self.outlineColor, self.outlineWidth)
 
     def update(self):
         '''Card.update() -> None
-        updates the card at its current position'''
-        
-        # shake the card
-        if self.shakeClock.get_time() != self.shakeClock.get_max() and self.shakeClock.get_max() != None:
-            self.move((
-                self.position[0] + random.randint(-self.shakeViolence, self.shakeViolence),
-                self.position[1] + random.randint(-self.shakeViolence, self.shakeViolence),
-            ))
-            
-        # move the card
-        elif self.isMoving:
-            self.move((
-                self.position[0] + (self.moveDest[0] - self.position[0]) * self.moveClock.get_time() / self.moveClock.get_max(),
-                self.position[1] + (self.moveDest[1] - self.position[1]) * self.moveClock.get_time() / self.moveClock.get_max()
-            ))
-            if self.moveClock.get_time() == self.moveClock.get_max():
-                self.isMoving = False
-                self.pos(self.moveDest)
-
-        # reset the card after shaking     
-        else:
-            self.pos(self.position)
-
-        self.game.blit(self.sides[f"display-{self.currentSide}"], (self.get_rect()[0], self.get_rect()[1]))        
+        draws the card at its current position
+        moving and shaking are run by the game's tweens'''
+        self.mark_drawn()
+        side = self.displayFace if self.currentSide == "face" else self.displayBack
+        if side is None:
+            side = self.get_display_side()
+        self.game.blit(side, (self.rect[0], self.rect[1]))
 
 class CardDeck:
     '''represents a deck of cards'''
@@ -619,8 +1109,11 @@ class CardDeck:
             longer appear when the deck or discard pile is empty
         Setting preshuffle to False (defaults to True) will make the deck not be shuffled after loading it'''
         self.game = game
-        self.deck = []
-        self.discard = []
+
+        # the top of the deck is the left end, the top of the discard is the right end
+        # the deck draws the cards in its piles, see CardDeck._claim_card
+        self.deck = _CardPile(onAdd = self._claim_deck_card, onRemove = self._release_card)
+        self.discard = _CardPile(onAdd = self._claim_card, onRemove = self._release_card)
         self.deckLocation = location
         self.discardLocation = 0,0
         self.hasMovedDiscard = False
@@ -678,26 +1171,28 @@ class CardDeck:
         self.discardEmpty.pos(self.discardLocation)
 
     def get_deck(self):
-        '''CardDeck.get_deck() -> list
-        returns the deck of Card objects'''
+        '''CardDeck.get_deck() -> list-like
+        returns the deck of Card objects, top first
+        it can be sliced and changed like a list'''
         return self.deck
 
     def get_discard(self):
-        '''CardDeck.get_discard() -> list
-        returns the discard pile of Card objects'''
+        '''CardDeck.get_discard() -> list-like
+        returns the discard pile of Card objects, top last
+        it can be sliced and changed like a list'''
         return self.discard
 
     def set_discard(self, newDiscard):
         '''CardDeck.set_discard(Card[]) -> None
         sets the discard pile with a list of Card objects'''
-        self.discard = newDiscard
+        self.discard.clear()
+        self.discard.extend(newDiscard)
 
     def set_deck(self, newDeck):
         '''CardDeck.set_deck(Card[]) -> None
         sets the deck with a list of Card objects'''
-        self.unbind_deck_click()
-        self.deck = newDeck
-        self.rebind_deck_click()
+        self.deck.clear()
+        self.deck.extend(newDeck)
 
     def load_deck(self, size = "medium", backColor = (21, 60, 129), outlineColor = (50,50,50),
             outlineWidth = 2, preloadDeck = None, includeJokers = True,
@@ -707,9 +1202,10 @@ class CardDeck:
         If newDeck is None, a new full deck will be created
         If newDeck is provided, the deck is loaded from that
         A single card should look this: (face, suit, color) or ("10", "heart", "red")'''
+        # the old cards are thrown away, so they aren't given back to the mainloop to draw
         self.unbind_deck_click()
-        self.deck.clear()
-        self.discard.clear()
+        self.deck._replace_all([])
+        self.discard._replace_all([])
 
         self.visualStackHeight = visualStackHeight
         self.showEmptyPiles = showEmptyPiles
@@ -736,6 +1232,8 @@ class CardDeck:
         self.deckEmpty = Card(self.game, ("EMPTY", "heart", "red"), size, outlineColor = (130,130,130), outlineWidth = 2)
         self.deckEmpty.pos(self.deckLocation)
         self.deckEmpty.flip_card()
+        self._claim_card(self.discardEmpty)
+        self._claim_card(self.deckEmpty)
 
         # set the location of all new cards
         self.size = size
@@ -744,24 +1242,38 @@ class CardDeck:
         if not self.hasMovedDiscard:
             self.set_discard_location((get_sizes(outlineWidth)[self.size][0] * 1.15,0), True, True)
 
-        # fix all vent bindings and card offsets
+        # fix all card offsets
         self.redo_deck_stack_visual()
-        self.rebind_deck_click()
+
+    def prewarm(self, cardsPerFrame = 4):
+        '''CardDeck.prewarm(cardsPerFrame = 4) -> None
+        builds the sides of every card in the background, a few cards each frame
+        so the first flip of a card doesn't have to render it
+        if cardsPerFrame is None, every card is built right away'''
+        cards = list(self.deck) + list(self.discard)
+        if cardsPerFrame == None:
+            for card in cards:
+                card.prewarm()
+            return
+
+        def prewarm_next(start = 0):
+            for card in cards[start:start + cardsPerFrame]:
+                card.prewarm()
+            if start + cardsPerFrame < len(cards):
+                self.game.after(0, lambda: prewarm_next(start + cardsPerFrame))
+
+        self.game.after(0, prewarm_next)
 
     def onclick(self, command = None):
         '''CardDeck.onclick(command = None) -> None
         sets what happens when you click the top card of the deck
         if set to None, nothing will happen when card is clicked'''
-        self.unbind_deck_click()
         self.eventCommand = command
-        self.rebind_deck_click()
         
     def shuffle_deck(self):
         '''CardDeck.shuffle_deck() -> None
         shuffles the current deck'''
-        self.unbind_deck_click()
-        random.shuffle(self.deck)
-        self.rebind_deck_click()
+        self.deck.shuffle()
         self.redo_deck_stack_visual()
 
     def get_top_of_deck(self):
@@ -776,12 +1288,40 @@ class CardDeck:
         removes the card on top of the card deck (first element)
         returns the removed card'''
         if len(self.deck) == 0: return
-        self.unbind_deck_click()
-        output = self.deck.pop(0)
-        self.rebind_deck_click()
-        self.redo_deck_stack_visual()
+        output = self.deck.popleft()
+
+        # the offsets are counted from the bottom, so the other cards don't move
         return output
 
+    def deal(self, numCards, locations = None, staggerMs = 60, flip = False):
+        '''CardDeck.deal(int, [(x,y), ...] = None, staggerMs = 60, flip = False) -> Card[]
+        removes numCards cards from the top of the deck at once and returns them
+        returns fewer cards if the deck runs out
+        if locations is given, each card moves to its location, starting staggerMs
+        milliseconds after the one before it, and is flipped when it arrives if flip is True
+        dealt cards are drawn by the game's mainloop again, not by the deck'''
+        numCards = min(numCards, len(self.deck))
+        cards = [self.deck.popleft() for i in range(numCards)]
+
+        if locations != None:
+            _animate_deal(cards, locations, self.movementSpeed, staggerMs, flip)
+        return cards
+
+    def deal_hands(self, numHands, cardsPerHand, locations = None, spread = (20, 0), staggerMs = 60, flip = False):
+        '''CardDeck.deal_hands(int, int, [(x,y), ...] = None, (x,y) = (20, 0), staggerMs = 60, flip = False) -> Card[][]
+        deals cardsPerHand cards to each of numHands hands, one card at a time around the table
+        returns a list of hands, each a list of Cards
+        if locations (one per hand) is given, the cards move to their hand,
+        each card in a hand offset by spread from the one before it
+        staggerMs and flip work the same as in CardDeck.deal'''
+        cards = self.deal(numHands * cardsPerHand)
+        hands = [cards[i::numHands] for i in range(numHands)]
+
+        if locations != None:
+            _animate_deal(cards, _get_hand_positions(len(cards), numHands, locations, spread),
+                self.movementSpeed, staggerMs, flip)
+        return hands
+
     def get_top_of_discard(self):
         '''CardDeck.get_top_of_discard() -> Card
         returns the card on top of the discard
@@ -794,52 +1334,87 @@ class CardDeck:
         removes the card on top of the discard (last element)
         returns the removed card'''
         if len(self.discard) == 0: return
-        self.redo_discard_stack_visual()
         return self.discard.pop()
 
     def unbind_deck_click(self):
         '''CardDeck.unbind_deck_click() -> None
-        unbinds the one event attached to the card deck
-        function that was called is CardDeck.move_top_card_to_discard'''
-        if len(self.deck) > 0:
-            self.get_top_of_deck().remove_event("on-deck-click")
+        unbinds the click event from every card in the deck'''
+        for card in self.deck:
+            card.remove_event("on-deck-click")
 
     def rebind_deck_click(self):
-        '''CardDeck.rebind_deck_click(self):
-        rebinds the one event attached to the card deck
-        function called is CardDeck.process_move_top_card_to_discard'''
-        if len(self.deck) > 0 and self.eventCommand != None:
-            self.get_top_of_deck().onclick("on-deck-click", self.eventCommand)
+        '''CardDeck.rebind_deck_click() -> None
+        binds the click event to every card in the deck
+        the event only calls the onclick command when the top card is clicked'''
+        for card in self.deck:
+            self._bind_deck_card(card)
+
+    def _bind_deck_card(self, card):
+        '''CardDeck._bind_deck_card(Card) -> None
+        binds the deck click event to card
+        cards keep the binding while they're in the deck, and clicks only reach the card
+        drawn on top, so nothing has to be rebound when the top card changes'''
+        card.onclick("on-deck-click", lambda event = None: self._event_deck_click(card, event))
+
+    def _claim_card(self, card):
+        '''CardDeck._claim_card(Card) -> None
+        called for every card that goes into a pile, however it gets there
+        the deck draws the cards in its piles (only the ones that can be seen),
+        so the game's mainloop stops drawing card'''
+        card.set_update_status(False)
+
+    def _claim_deck_card(self, card):
+        '''CardDeck._claim_deck_card(Card) -> None
+        claims a card that went into the deck and gives it the deck click'''
+        self._claim_card(card)
+        self._bind_deck_card(card)
+
+    def _release_card(self, card):
+        '''CardDeck._release_card(Card) -> None
+        called for every card that comes out of a pile, however it's taken out
+        gives the card back to the game's mainloop to draw'''
+        card.remove_event("on-deck-click")
+        card.set_update_status(True)
+
+    def _event_deck_click(self, card, event = None):
+        '''CardDeck._event_deck_click(Card, event = None) -> None
+        calls the onclick command if card is the top of the deck and isn't moving'''
+        if self.eventCommand == None or len(self.deck) == 0 or self.deck[0] is not card or card.isMoving:
+            return
+        try:
+            self.eventCommand(event)
+        except TypeError:
+            self.eventCommand()
 
     def restack(self):
         '''CardDeck.restack() -> None
         restacks the deck with the discard pile
         the discard is added to the bottom of the deck'''
-        self.deck.extend(self.discard)
+        cards = list(self.discard)
+        numAdded = len(cards)
         self.discard.clear()
-        self.redo_deck_stack_visual()
+        self.deck.extend(cards)
+        self.redo_deck_stack_visual(numAdded + self.visualStackHeight)
 
     def add_card_to_deck(self, card):
         '''CardDeck.add_card_to_deck(Card) -> None
         adds a card to the BOTTOM of the deck
         accomblished by adding it to the end of the list'''
         self.deck.append(card)
-        self.redo_deck_stack_visual()
+        self.redo_deck_stack_visual(self.visualStackHeight)
 
     def add_card_to_discard(self, card):
         '''CardDeck.add_card_to_discard(Card) -> None
         adds a card to the TOP of the discard pile
         accomblished by adding it to the end of the list'''
         self.discard.append(card)
-        self.redo_discard_stack_visual()
+        self.redo_discard_stack_visual(1)
 
     def move_top_card_to_discard(self, event = None):
         '''CardDeck.move_top_card_to_discard(event = None) -> None
         This is called whenever the top card in the deck is clicked'''
         card = self.get_top_of_deck()
         if card != None:
-            self.unbind_deck_click()
-
             # determine where to put the card and stick respect the stack visual
             if len(self.discard) < 1:
                 moveTo = self.discardLocation
@@ -851,8 +1426,7 @@ class CardDeck:
                     self.discardLocation[1] - self.outlineWidth * 2 * (self.visualStackHeight - 1))
 
             # move the card and then flip it after it stops moving
-            timeToMove = card.move_to(moveTo, self.movementSpeed)
-            self.game.after(timeToMove + 100, self.discard_top_card)
+            card.move_to(moveTo, self.movementSpeed, self.discard_top_card)
 
     def discard_top_card(self, animateFlip = True):
         '''CardDeck.discard_top_card(animateFlip = True) -> None
@@ -866,47 +1440,502 @@ class CardDeck:
         else:
             card.flip_card()
 
-    def redo_deck_stack_visual(self):
-        '''CardDeck.redo_deck_stack_visual() -> None
+    def redo_deck_stack_visual(self, bottomCards = None):
+        '''CardDeck.redo_deck_stack_visual(bottomCards = None) -> None
         goes through all cards in the deck and creates the stack visual offset
         this is to give the pile a 3Dish look
-        called after a change in the deck to redo the visual'''
-        for i in range(len(self.deck)):
-            visualHeight = min(self.visualStackHeight - 1, len(self.deck) - i - 1)
+        called after a change in the deck to redo the visual
+        if bottomCards is given, only that many cards from the bottom are moved'''
+        numCards = len(self.deck)
+        start = 0 if bottomCards == None else max(0, numCards - bottomCards)
+        for i in range(start, numCards):
+            visualHeight = min(self.visualStackHeight - 1, numCards - i - 1)
             self.deck[i].pos((
                 self.deckLocation[0] - self.outlineWidth * 2 * visualHeight,
                 self.deckLocation[1] - self.outlineWidth * 2 * visualHeight
             ))
 
-    def redo_discard_stack_visual(self):
-        '''CardDeck.redo_discard_stack_visual() -> None
+    def redo_discard_stack_visual(self, topCards = None):
+        '''CardDeck.redo_discard_stack_visual(topCards = None) -> None
         goes through all cards in the discard and creates the stack visual offset
         this is to give the pile a 3Dish look
-        called after a change in the discard to redo the visual'''
-        for i in range(len(self.discard)):
+        called after a change in the discard to redo the visual
+        if topCards is given, only that many cards from the top are moved'''
+        numCards = len(self.discard)
+        start = 0 if topCards == None else max(0, numCards - topCards)
+        for i in range(start, numCards):
             visualHeight = min(self.visualStackHeight - 1, i)
             self.discard[i].pos((
                 self.discardLocation[0] - self.outlineWidth * 2 * visualHeight,
                 self.discardLocation[1] - self.outlineWidth * 2 * visualHeight
             ))
 
+    def _get_visible_indexes(self, numCards):
+        '''CardDeck._get_visible_indexes(int) -> range or list
+        returns the indexes, counted from the bottom of a pile, of the cards that can be seen
+        the bottom visualStackHeight - 1 cards each have their own offset, and every card above
+        them sits under the top card, so only the top two of those (the second shows while the
+        top card moves or shakes) need drawing'''
+        if numCards <= self.visualStackHeight + 1:
+            return range(numCards)
+        return list(range(self.visualStackHeight - 1)) + [numCards - 2, numCards - 1]
+
     def update(self):
         '''CardDeck.update() -> None
-        renders and updates the card deck'''
+        renders and updates the card deck
+        only the cards that can be seen are drawn'''
         
         # draw the discard pile
         if len(self.discard) == 0 and self.showEmptyPiles:
             self.discardEmpty.update()
         else:
-            for i in range(len(self.discard)):
+            for i in self._get_visible_indexes(len(self.discard)):
                 self.discard[i].update()
 
         # draw the deck
         if len(self.deck) == 0 and self.showEmptyPiles:
             self.deckEmpty.update()
         else:
-            for j in range(len(self.deck)-1, -1, -1):
-                self.deck[j].update()
+            numCards = len(self.deck)
+            for i in self._get_visible_indexes(numCards):
+                self.deck[numCards - i - 1].update()
+
+class CardShoe:
+    '''represents a shoe of several decks, like the ones used in casinos
+    cards in the shoe are kept as (face, suit, color) tuples, and Card widgets are only
+    made for the cards that are dealt, then reused once they are discarded'''
+
+    def __init__(self, game, location, numDecks = 6,
+        size = "medium", backColor = (21, 60, 129), outlineColor = (50,50,50), outlineWidth = 2,
+        includeJokers = False, penetration = 0.75, visualStackHeight = 3, showEmptyPiles = True, preshuffle = True):
+        '''CardShoe(gs.Game, (x,y), int, str, (r,g,b), (r,g,b), int, bool, float, int, bool, bool) -> CardShoe
+        builds a shoe from numDecks decks
+        penetration is how much of the shoe is dealt before the cut card comes out
+        visualStackHeight and showEmptyPiles work like they do for CardDeck'''
+        self.game = game
+        self.shoeLocation = location
+        self.discardLocation = location[0] + get_sizes(outlineWidth)[size][0] * 1.15, location[1]
+        self.numDecks = numDecks
+        self.size = size
+        self.backColor = backColor
+        self.outlineColor = outlineColor
+        self.outlineWidth = outlineWidth
+        self.includeJokers = includeJokers
+        self.penetration = penetration
+        self.visualStackHeight = visualStackHeight
+        self.showEmptyPiles = showEmptyPiles
+        self.movementSpeed = 1500
+        self.eventCommand = None
+
+        # the top of the shoe is the left end, the top of the discard is the right end
+        self.shoe = _CardPile()
+        self.discard = _CardPile()
+        self.widgetPool = []
+        self.numDealt = 0
+        self.cutCard = 0
+
+        # the piles are drawn with a few face down cards
+        self.shoeStack = [self._make_stack_card() for i in range(visualStackHeight)]
+        self.discardStack = [self._make_stack_card() for i in range(visualStackHeight)]
+        self.shoeEmpty = Card(game, ("EMPTY", "heart", "red"), size, outlineColor = (130,130,130), outlineWidth = 2)
+        self.shoeEmpty.flip_card()
+        self.discardEmpty = Card(game, ("EMPTY", "heart", "red"), size, outlineColor = (130,130,130), outlineWidth = 2)
+        self.discardEmpty.flip_card()
+        self.shoeEmpty.set_update_status(False)
+        self.discardEmpty.set_update_status(False)
+        self.shoeStack[-1].onclick("on-shoe-click", self._event_shoe_click)
+        self.set_shoe_location(location)
+
+        self.load_shoe(numDecks, preshuffle)
+
+    def __len__(self):
+        '''len(CardShoe) -> int
+        returns the number of cards left in the shoe'''
+        return len(self.shoe)
+
+    def _make_stack_card(self):
+        '''CardShoe._make_stack_card() -> Card
+        returns a face down card used to draw the piles
+        the shoe draws these itself, so the game's mainloop doesn't'''
+        card = Card(self.game, ("EMPTY", "heart", "red"), self.size,
+            self.backColor, self.outlineColor, self.outlineWidth)
+        card.set_update_status(False)
+        return card
+
+    def _event_shoe_click(self, event = None):
+        '''CardShoe._event_shoe_click(event = None) -> None
+        called when the top of the shoe is clicked'''
+        if len(self.shoe) > 0 and self.eventCommand != None:
+            self.eventCommand()
+
+    def onclick(self, command = None):
+        '''CardShoe.onclick(command = None) -> None
+        sets what happens when you click the top of the shoe
+        if set to None, nothing will happen when the shoe is clicked'''
+        self.eventCommand = command
+
+    def get_movement_speed(self):
+        '''CardShoe.get_movement_speed() -> int
+        returns the speed of dealt cards (pixels / second)'''
+        return self.movementSpeed
+
+    def set_movement_speed(self, newSpeed):
+        '''CardShoe.set_movement_speed(int) -> None
+        sets the speed of dealt cards (pixels / second)'''
+        self.movementSpeed = newSpeed
+
+    def get_shoe_location(self):
+        '''CardShoe.get_shoe_location() -> (x,y)
+        returns the location of the shoe'''
+        return self.shoeLocation
+
+    def get_discard_location(self):
+        '''CardShoe.get_discard_location() -> (x,y)
+        returns the location of the discard pile'''
+        return self.discardLocation
+
+    def _get_stack_position(self, location, height):
+        '''CardShoe._get_stack_position((x,y), int) -> (x,y)
+        returns where a card height cards up a pile at location goes'''
+        return (location[0] - self.outlineWidth * 2 * height,
+            location[1] - self.outlineWidth * 2 * height)
+
+    def set_shoe_location(self, newLocation):
+        '''CardShoe.set_shoe_location((x,y)) -> None
+        sets the location of the shoe'''
+        self.shoeLocation = newLocation
+        for i in range(self.visualStackHeight):
+            self.shoeStack[i].pos(self._get_stack_position(newLocation, i))
+        self.shoeEmpty.pos(newLocation)
+        self.set_discard_location(self.discardLocation)
+
+    def set_discard_location(self, newLocation):
+        '''CardShoe.set_discard_location((x,y)) -> None
+        sets the location of the discard pile'''
+        self.discardLocation = newLocation
+        for i in range(self.visualStackHeight):
+            self.discardStack[i].pos(self._get_stack_position(newLocation, i))
+        self.discardEmpty.pos(newLocation)
+
+    def load_shoe(self, numDecks = None, preshuffle = True):
+        '''CardShoe.load_shoe(int = None, bool = True) -> None
+        fills the shoe with numDecks new decks and empties the discard
+        numDecks defaults to the number of decks the shoe was made with'''
+        if numDecks != None:
+            self.numDecks = numDecks
+        self.shoe.clear()
+        self.discard.clear()
+        for i in range(self.numDecks):
+            self.shoe.extend(get_deck(self.includeJokers, False))
+        if preshuffle:
+            self.reshuffle()
+        else:
+            self._place_cut_card()
+
+    def _place_cut_card(self):
+        '''CardShoe._place_cut_card() -> None
+        puts the cut card in after penetration of the shoe'''
+        self.numDealt = 0
+        self.cutCard = round(len(self.shoe) * self.penetration)
+
+    def get_penetration(self):
+        '''CardShoe.get_penetration() -> float
+        returns how much of the shoe is dealt before the cut card'''
+        return self.penetration
+
+    def set_penetration(self, penetration):
+        '''CardShoe.set_penetration(float) -> None
+        sets how much of the shoe is dealt before the cut card
+        takes effect at the next reshuffle'''
+        self.penetration = penetration
+
+    def get_cards_until_cut(self):
+        '''CardShoe.get_cards_until_cut() -> int
+        returns the number of cards that can be dealt before the cut card comes out'''
+        return max(0, self.cutCard - self.numDealt)
+
+    def needs_shuffle(self):
+        '''CardShoe.needs_shuffle() -> bool
+        returns if the cut card has come out or the shoe is empty'''
+        return self.numDealt >= self.cutCard or len(self.shoe) == 0
+
+    def reshuffle(self):
+        '''CardShoe.reshuffle() -> None
+        puts the discard pile back in the shoe, shuffles it and places the cut card
+        cards that are still dealt out stay out until they are discarded'''
+        cards = list(self.shoe)
+        cards.extend(self.discard)
+        self.discard.clear()
+        random.shuffle(cards)
+        self.shoe.clear()
+        self.shoe.extend(cards)
+        self._place_cut_card()
+
+    def get_shoe(self):
+        '''CardShoe.get_shoe() -> list-like
+        returns the (face, suit, color) tuples left in the shoe, top first'''
+        return self.shoe
+
+    def get_discard(self):
+        '''CardShoe.get_discard() -> list-like
+        returns the (face, suit, color) tuples in the discard pile, top last'''
+        return self.discard
+
+    def _get_card_widget(self, card):
+        '''CardShoe._get_card_widget((face, suit, color)) -> Card
+        returns a face down Card widget for card, reusing a discarded one if there is one'''
+        if len(self.widgetPool) == 0:
+            return Card(self.game, card, self.size, self.backColor, self.outlineColor, self.outlineWidth)
+
+        widget = self.widgetPool.pop()
+        widget.set_card(card)
+        widget.set_update_status(True)
+        return widget
+
+    def deal(self, numCards, locations = None, staggerMs = 60, flip = False):
+        '''CardShoe.deal(int, [(x,y), ...] = None, staggerMs = 60, flip = False) -> Card[]
+        takes numCards cards off the top of the shoe and returns them as Card widgets
+        returns fewer cards if the shoe runs out
+        locations, staggerMs and flip work the same as in CardDeck.deal
+        the shoe doesn't draw dealt cards, and they should be given back with CardShoe.discard_cards'''
+        numCards = min(numCards, len(self.shoe))
+        top = self._get_stack_position(self.shoeLocation, min(self.visualStackHeight, len(self.shoe)) - 1)
+        cards = []
+        for i in range(numCards):
+            card = self._get_card_widget(self.shoe.popleft())
+            card.pos(top)
+            cards.append(card)
+        self.numDealt += numCards
+
+        if locations != None:
+            _animate_deal(cards, locations, self.movementSpeed, staggerMs, flip)
+        return cards
+
+    def deal_hands(self, numHands, cardsPerHand, locations = None, spread = (20, 0), staggerMs = 60, flip = False):
+        '''CardShoe.deal_hands(int, int, [(x,y), ...] = None, (x,y) = (20, 0), staggerMs = 60, flip = False) -> Card[][]
+        deals cardsPerHand cards to each of numHands hands, one card at a time around the table
+        works the same as CardDeck.deal_hands'''
+        cards = self.deal(numHands * cardsPerHand)
+        hands = [cards[i::numHands] for i in range(numHands)]
+
+        if locations != None:
+            _animate_deal(cards, _get_hand_positions(len(cards), numHands, locations, spread),
+                self.movementSpeed, staggerMs, flip)
+        return hands
+
+    def discard_cards(self, cards):
+        '''CardShoe.discard_cards(Card[]) -> None
+        puts dealt cards on top of the discard pile
+        the Card widgets are kept to be reused, so don't use them after discarding them
+        pooled widgets aren't drawn or clicked until they are dealt again'''
+        for card in cards:
+            self.discard.append(card.get_card())
+
+            # reset the widget so it comes back like a new card
+            card.events.clear()
+            card.stop_animations()
+            card.flip_card("back")
+            if card.get_rotation() != 0:
+                card.rotate_card(0)
+            card.set_update_status(False)
+            self.widgetPool.append(card)
+
+    def update(self):
+        '''CardShoe.update() -> None
+        draws the shoe and the discard pile'''
+
+        # draw the discard pile
+        if len(self.discard) == 0:
+            if self.showEmptyPiles:
+                self.discardEmpty.update()
+        else:
+            for i in range(min(self.visualStackHeight, len(self.discard))):
+                self.discardStack[i].update()
+
+        # draw the shoe, the top stack card is always drawn last so it can be clicked
+        if len(self.shoe) == 0:
+            if self.showEmptyPiles:
+                self.shoeEmpty.update()
+        else:
+            numShown = min(self.visualStackHeight, len(self.shoe))
+            for i in range(numShown - 1):
+                self.shoeStack[i].update()
+            self.shoeStack[-1].pos(self._get_stack_position(self.shoeLocation, numShown - 1))
+            self.shoeStack[-1].update()
+
+class CardDeckBatch:
+    '''runs many decks at once as numpy arrays, without any widgets
+    cards are small integer codes (see encode_card), and every deck is dealt,
+    discarded and restacked in lockstep with the same rules as CardDeck:
+    the top of the deck is the first card and the top of the discard is the last card'''
+
+    def __init__(self, numDecks, includeJokers = True, preshuffle = True, seed = None, preloadDeck = None):
+        '''CardDeckBatch(int, bool, bool, int, list) -> CardDeckBatch
+        sets up numDecks copies of a deck
+        preloadDeck is a list of card tuples or codes, and defaults to get_deck(includeJokers)
+        seed seeds the shuffling'''
+        if np == None:
+            raise gs.GameSetupError("CardDeckBatch requires numpy")
+
+        self.numDecks = numDecks
+        self.rng = np.random.default_rng(seed)
+        if preloadDeck is None:
+            preloadDeck = get_deck(includeJokers, False)
+        self._load(np.tile(encode_deck(preloadDeck), (numDecks, 1)),
+            np.zeros((numDecks, 0), np.int8))
+        if preshuffle:
+            self.shuffle()
+
+    def __len__(self):
+        '''len(CardDeckBatch) -> int
+        returns the number of decks'''
+        return self.numDecks
+
+    def _load(self, deck, discard):
+        '''CardDeckBatch._load(array, array) -> None
+        sets every deck and discard pile from (numDecks, numCards) arrays of codes'''
+        self.capacity = max(54, deck.shape[1] + discard.shape[1])
+
+        # the deck is a ring, so dealing from the top and adding to the bottom don't move cards
+        self.cards = np.zeros((self.numDecks, self.capacity), np.int8)
+        self.cards[:, :deck.shape[1]] = deck
+        self.top = 0
+        self.numCards = deck.shape[1]
+        self.discardCards = np.zeros((self.numDecks, self.capacity), np.int8)
+        self.discardCards[:, :discard.shape[1]] = discard
+        self.numDiscard = discard.shape[1]
+
+    def _get_columns(self, start, numCards):
+        '''CardDeckBatch._get_columns(int, int) -> array
+        returns the ring columns of numCards cards starting start cards below the top'''
+        return (self.top + start + np.arange(numCards)) % self.capacity
+
+    def get_deck(self):
+        '''CardDeckBatch.get_deck() -> array
+        returns a (numDecks, numCards) array of the decks, top card first'''
+        return self.cards[:, self._get_columns(0, self.numCards)]
+
+    def get_discard(self):
+        '''CardDeckBatch.get_discard() -> array
+        returns a (numDecks, numCards) array of the discard piles, top card last'''
+        return self.discardCards[:, :self.numDiscard].copy()
+
+    def get_num_cards(self):
+        '''CardDeckBatch.get_num_cards() -> int
+        returns the number of cards left in each deck'''
+        return self.numCards
+
+    def shuffle(self):
+        '''CardDeckBatch.shuffle() -> None
+        shuffles every deck with its own random order'''
+        order = np.argsort(self.rng.random((self.numDecks, self.numCards)), 1)
+        self.cards[:, :self.numCards] = np.take_along_axis(self.get_deck(), order, 1)
+        self.top = 0
+
+    def get_top_of_deck(self):
+        '''CardDeckBatch.get_top_of_deck() -> array
+        returns the top card of every deck, or None if the decks are empty'''
+        if self.numCards == 0: return
+        return self.cards[:, self.top].copy()
+
+    def deal(self, numCards):
+        '''CardDeckBatch.deal(int) -> array
+        removes numCards cards from the top of every deck
+        returns them as a (numDecks, numCards) array, with fewer cards if the decks run out'''
+        numCards = min(numCards, self.numCards)
+        output = self.cards[:, self._get_columns(0, numCards)]
+        self.top = (self.top + numCards) % self.capacity
+        self.numCards -= numCards
+        return output
+
+    def pop_top_of_deck(self):
+        '''CardDeckBatch.pop_top_of_deck() -> array
+        removes the top card of every deck and returns them
+        returns None if the decks are empty'''
+        if self.numCards == 0: return
+        return self.deal(1)[:, 0]
+
+    def deal_hands(self, numHands, cardsPerHand):
+        '''CardDeckBatch.deal_hands(int, int) -> array
+        deals cardsPerHand cards to each of numHands hands, one card at a time around the table
+        returns a (numDecks, numHands, cardsPerHand) array'''
+        if numHands * cardsPerHand > self.numCards:
+            raise gs.GameSetupError(f"Can't deal {numHands * cardsPerHand} cards from {self.numCards}")
+        cards = self.deal(numHands * cardsPerHand)
+        return cards.reshape(self.numDecks, cardsPerHand, numHands).transpose(0, 2, 1)
+
+    def add_cards_to_deck(self, cards):
+        '''CardDeckBatch.add_cards_to_deck(array) -> None
+        adds cards to the BOTTOM of every deck
+        cards is a (numDecks,) or (numDecks, numCards) array of codes'''
+        cards = np.asarray(cards, np.int8).reshape(self.numDecks, -1)
+        if self.numCards + cards.shape[1] > self.capacity:
+            raise gs.GameSetupError("CardDeckBatch deck is full")
+        self.cards[:, self._get_columns(self.numCards, cards.shape[1])] = cards
+        self.numCards += cards.shape[1]
+
+    def get_top_of_discard(self):
+        '''CardDeckBatch.get_top_of_discard() -> array
+        returns the top card of every discard pile, or None if they are empty'''
+        if self.numDiscard == 0: return
+        return self.discardCards[:, self.numDiscard - 1].copy()
+
+    def pop_top_of_discard(self):
+        '''CardDeckBatch.pop_top_of_discard() -> array
+        removes the top card of every discard pile and returns them
+        returns None if the discard piles are empty'''
+        if self.numDiscard == 0: return
+        self.numDiscard -= 1
+        return self.discardCards[:, self.numDiscard].copy()
+
+    def add_cards_to_discard(self, cards):
+        '''CardDeckBatch.add_cards_to_discard(array) -> None
+        adds cards to the TOP of every discard pile, the last card ending on top
+        cards is a (numDecks,) or (numDecks, numCards) array of codes'''
+        cards = np.asarray(cards, np.int8).reshape(self.numDecks, -1)
+        if self.numDiscard + cards.shape[1] > self.capacity:
+            raise gs.GameSetupError("CardDeckBatch discard pile is full")
+        self.discardCards[:, self.numDiscard:self.numDiscard + cards.shape[1]] = cards
+        self.numDiscard += cards.shape[1]
+
+    def discard_top_card(self):
+        '''CardDeckBatch.discard_top_card() -> None
+        moves the top card of every deck to the top of its discard pile'''
+        if self.numCards == 0: return
+        self.add_cards_to_discard(self.deal(1))
+
+    def restack(self):
+        '''CardDeckBatch.restack() -> None
+        restacks every deck with its discard pile
+        the discard is added to the bottom of the deck'''
+        self.add_cards_to_deck(self.discardCards[:, :self.numDiscard])
+        self.numDiscard = 0
+
+    def load_card_deck(self, cardDeck):
+        '''CardDeckBatch.load_card_deck(CardDeck) -> None
+        sets every deck and discard pile to match a CardDeck'''
+        deck = encode_deck(cardDeck.get_deck())
+        discard = encode_deck(cardDeck.get_discard())
+        self._load(np.tile(deck, (self.numDecks, 1)),
+            np.tile(discard, (self.numDecks, 1)).reshape(self.numDecks, len(discard)))
+
+    def to_card_deck(self, index, game, location, **attributes):
+        '''CardDeckBatch.to_card_deck(int, gs.Game, (x,y), **attributes) -> CardDeck
+        returns a CardDeck showing deck index and its discard pile
+        attributes are passed on to CardDeck, like size or backColor'''
+        deck = decode_deck(self.get_deck()[index])
+        discard = decode_deck(self.get_discard()[index])
+
+        # the discard cards are loaded under the deck and then moved over face up
+        attributes["preshuffle"] = False
+        cardDeck = CardDeck(game, location, preloadDeck = deck + discard[::-1], **attributes)
+        for i in range(len(discard)):
+            card = cardDeck.get_deck().pop()
+            card.flip_card("face")
+            cardDeck.get_discard().append(card)
+        cardDeck.redo_deck_stack_visual()
+        cardDeck.redo_discard_stack_visual()
+        return cardDeck
 
 class _TestGame(gs.Game):
     ''' quick test game for the cards and card deck'''
@@ -1051,11 +2080,301 @@ def get_deck(includeJokers = True, preshuffle = True):
 
     return deck
     
-            
+
+def encode_card(card):
+    '''encode_card((face, suit, color) or Card) -> int
+    returns the code for a card from get_deck (codes are returned as they are)
+    code is faceIndex * 4 + suitIndex using get_faces() and get_suits(),
+    the red joker is 52 and the black joker is 53'''
+    if isinstance(card, Card):
+        card = card.get_card()
+    elif not isinstance(card, (tuple, list)):
+        return int(card)
+    face, suit, color = card
+    if face == "JOKER":
+        if color in _JOKER_COLORS:
+            return 52 + _JOKER_COLORS.index(color)
+    elif face in _FACE_INDEXES and suit in _SUIT_INDEXES and color == _SUIT_COLORS[_SUIT_INDEXES[suit]]:
+        return _FACE_INDEXES[face] * 4 + _SUIT_INDEXES[suit]
+    raise gs.GameSetupError(f"Card {card} can't be encoded")
+
+def decode_card(code):
+    '''decode_card(int) -> (face, suit, color)
+    returns the card tuple for a code from encode_card'''
+    code = int(code)
+    if code >= 52:
+        return ("JOKER", "JOKER", _JOKER_COLORS[code - 52])
+    face, suit = divmod(code, 4)
+    return (get_faces()[face], get_suits()[suit], _SUIT_COLORS[suit])
+
+def encode_deck(cards):
+    '''encode_deck(list) -> array
+    returns an int8 numpy array of codes for a list of card tuples or Cards'''
+    if np == None:
+        raise gs.GameSetupError("encode_deck requires numpy")
+    return np.array([encode_card(card) for card in cards], np.int8)
+
+def decode_deck(codes):
+    '''decode_deck(array) -> list
+    returns a list of card tuples for an array of codes'''
+    return [decode_card(code) for code in codes]
+
+def _get_straight_high(rankBits):
+    '''_get_straight_high(int) -> int
+    returns the high rank of the best straight in a 13 bit rank mask (2 is 0, ace is 12)
+    returns -1 if there is no straight'''
+    for high in range(12, 3, -1):
+        if rankBits >> (high - 4) & 31 == 31:
+            return high
+
+    # the wheel, ace through 5
+    if rankBits & 0b1000000001111 == 0b1000000001111:
+        return 3
+    return -1
+
+def _get_hand_value(category, ranks):
+    '''_get_hand_value(int, int[]) -> int
+    returns the value of a hand from its category and up to 5 deciding ranks
+    the category goes in the top bits and each rank gets 4 bits below it'''
+    value = category
+    for i in range(5):
+        value = value << 4 | (ranks[i] if i < len(ranks) else 0)
+    return value
+
+def _get_flush_value(rankBits):
+    '''_get_flush_value(int) -> int
+    returns the value of the best flush or straight flush in a 13 bit rank mask'''
+    high = _get_straight_high(rankBits)
+    if high != -1:
+        return _get_hand_value(8, [high])
+    ranks = [rank for rank in range(12, -1, -1) if rankBits >> rank & 1]
+    return _get_hand_value(5, ranks[:5])
+
+def _get_rank_value(counts):
+    '''_get_rank_value(int[]) -> int
+    returns the value of the best hand, ignoring flushes, for the number of cards of each rank'''
+    ranks = [rank for rank in range(12, -1, -1) if counts[rank] > 0]
+    byCount = sorted(ranks, key = lambda rank: (counts[rank], rank), reverse = True)
+    best, second = byCount[0], byCount[1] if len(byCount) > 1 else -1
+
+    if counts[best] == 4:
+        return _get_hand_value(7, [best, max(rank for rank in ranks if rank != best)])
+    if counts[best] == 3 and second != -1 and counts[second] >= 2:
+        return _get_hand_value(6, [best, max(rank for rank in ranks if rank != best and counts[rank] >= 2)])
+
+    rankBits = sum(1 << rank for rank in ranks)
+    high = _get_straight_high(rankBits)
+    if high != -1:
+        return _get_hand_value(4, [high])
+
+    if counts[best] == 3:
+        return _get_hand_value(3, [best] + [rank for rank in ranks if rank != best][:2])
+    if counts[best] == 2 and counts[second] == 2:
+        return _get_hand_value(2, [best, second] +
+            [rank for rank in ranks if rank != best and rank != second][:1])
+    if counts[best] == 2:
+        return _get_hand_value(1, [best] + [rank for rank in ranks if rank != best][:3])
+    return _get_hand_value(0, ranks[:5])
+
+def _build_poker_tables():
+    '''_build_poker_tables() -> (array, array, array)
+    builds the flush table, indexed by a 13 bit rank mask, and a perfect hash table
+    of the best hand without flushes for every 5, 6, and 7 card rank count
+    the rank count key packs the number of cards of each rank into 3 bits per rank,
+    and it is hashed by _hash_rank_key'''
+    flushTable = np.zeros(8192, np.int32)
+    for rankBits in range(8192):
+        if bin(rankBits).count("1") >= 5:
+            flushTable[rankBits] = _get_flush_value(rankBits)
+
+    # every way to pick 5 to 7 ranks with at most 4 cards of each
+    keys = []
+    values = []
+    counts = [0] * 13
+    def add_counts(rank, numCards, key):
+        if rank == 13:
+            if numCards >= 5:
+                keys.append(key)
+                values.append(_get_rank_value(counts))
+            return
+        for count in range(min(4, 7 - numCards) + 1):
+            counts[rank] = count
+            add_counts(rank + 1, numCards + count, key | count << 3 * rank)
+        counts[rank] = 0
+    add_counts(0, 0, 0)
+
+    # group the keys by their first hash
+    keys = np.array(keys, np.uint64)
+    buckets, slots = _hash_rank_key(keys)
+    bucketSlots = {}
+    for i in range(len(keys)):
+        bucketSlots.setdefault(int(buckets[i]), []).append((int(slots[i]), values[i]))
+
+    # then give each bucket, biggest first, a displacement that moves its keys to free slots
+    displacements = np.zeros(1 << _POKER_BUCKET_BITS, np.int64)
+    hashTable = np.zeros(1 << _POKER_SLOT_BITS, np.int32)
+    used = set()
+    for bucket in sorted(bucketSlots, key = lambda bucket: -len(bucketSlots[bucket])):
+        displacement = 0
+        while True:
+            newSlots = [slot ^ displacement for slot, value in bucketSlots[bucket]]
+            if len(set(newSlots)) == len(newSlots) and used.isdisjoint(newSlots):
+                break
+            displacement += 1
+        displacements[bucket] = displacement
+        for slot, (oldSlot, value) in zip(newSlots, bucketSlots[bucket]):
+            used.add(slot)
+            hashTable[slot] = value
+
+    return flushTable, displacements, hashTable
+
+def _hash_rank_key(keys):
+    '''_hash_rank_key(array) -> (array, array)
+    returns the bucket and the slot before displacement for an array of rank count keys'''
+    keys = keys.astype(np.uint64)
+    buckets = (keys * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(64 - _POKER_BUCKET_BITS)
+    slots = (keys * np.uint64(0xC2B2AE3D27D4EB4F)) >> np.uint64(64 - _POKER_SLOT_BITS)
+    return buckets.astype(np.int64), slots.astype(np.int64)
+
+def _get_poker_tables():
+    '''_get_poker_tables() -> (array, array, array, array, array)
+    returns the flush, displacement, hash, card bit, and spread tables
+    the first three are loaded from the cache directory, or built and saved the first time'''
+    global _pokerTables
+    if _pokerTables != None:
+        return _pokerTables
+    if np == None:
+        raise gs.GameSetupError("poker hand evaluation requires numpy")
+
+    path = os.path.join(_get_default_cache_dir(), f"poker-tables-{GAME_VERSION}.npz")
+    try:
+        with np.load(path) as tables:
+            flushTable, displacements, hashTable = tables["flush"], tables["displacements"], tables["hash"]
+    except (OSError, ValueError, KeyError):
+        flushTable, displacements, hashTable = _build_poker_tables()
+        # the pid keeps processes that build the tables at once from sharing a temp file
+        tempPath = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tempPath, "wb") as file:
+                np.savez(file, flush = flushTable, displacements = displacements, hash = hashTable)
+            os.replace(tempPath, path)
+        except OSError:
+            pass
+
+    _pokerTables = flushTable, displacements, hashTable, _get_card_bits(), _get_spread_table()
+    return _pokerTables
+
+def get_hand_bits(hands):
+    '''get_hand_bits(array) -> array
+    turns a (numHands, numCards) array of card codes into one int64 per hand
+    with a bit for each card, at suit * 13 + rank where 2 is rank 0 and ace is rank 12
+    hands can be built up by adding the bits of cards that aren't already in them'''
+    return _get_poker_tables()[3][hands].sum(1)
+
+def evaluate_hand_bits(handBits):
+    '''evaluate_hand_bits(array) -> array
+    scores an array of hands from get_hand_bits, each with 5 to 7 cards
+    this skips the per card work in evaluate_hands, so it is the fastest way
+    to score many hands that share cards, like a board and each player's hole cards'''
+    flushTable, displacements, hashTable, cardBitTable, spread = _get_poker_tables()
+    handBits = np.asarray(handBits, np.int64)
+    suitBits = [(handBits >> 13 * suit) & 8191 for suit in range(4)]
+
+    # best hand without flushes, from how many cards there are of each rank
+    rankKeys = spread[suitBits[0]] + spread[suitBits[1]] + spread[suitBits[2]] + spread[suitBits[3]]
+    buckets, slots = _hash_rank_key(rankKeys)
+    rankValues = hashTable[slots ^ displacements[buckets]]
+
+    # a flush can only beat the hand if it uses 5 cards of one suit
+    flushValues = np.maximum(np.maximum(flushTable[suitBits[0]], flushTable[suitBits[1]]),
+        np.maximum(flushTable[suitBits[2]], flushTable[suitBits[3]]))
+
+    return np.maximum(rankValues, flushValues)
+
+def evaluate_hands(hands):
+    '''evaluate_hands(array) -> array
+    scores a (numHands, numCards) array of card codes (see encode_card), with 5 to 7 different cards each
+    returns an int32 array where a bigger value is a better poker hand
+    the best 5 cards of each hand are used, and jokers aren't allowed'''
+    hands = np.asarray(hands)
+    if hands.ndim != 2 or not 5 <= hands.shape[1] <= 7:
+        raise gs.GameSetupError("Hands must be an array of 5 to 7 cards each")
+    if hands.size > 0 and (hands.max() >= 52 or hands.min() < 0):
+        raise gs.GameSetupError("Jokers can't be scored in poker hands")
+    return evaluate_hand_bits(get_hand_bits(hands))
+
+def _get_card_bits():
+    '''_get_card_bits() -> array
+    returns the bit for each card code, at suit * 13 + rank where 2 is rank 0 and ace is rank 12'''
+    faces, suits = np.divmod(np.arange(52), 4)
+    return np.left_shift(1, suits * 13 + (faces + 12) % 13, dtype = np.int64)
+
+def _get_spread_table():
+    '''_get_spread_table() -> array
+    returns a table that turns a 13 bit rank mask into a rank count key with 3 bits per rank'''
+    spread = np.zeros(8192, np.int64)
+    for rank in range(13):
+        spread[np.arange(8192) >> rank & 1 == 1] += 1 << 3 * rank
+    return spread
+
+def evaluate_hand(cards):
+    '''evaluate_hand(list) -> int
+    scores a hand of 5 to 7 card tuples, Cards, or codes
+    a bigger value is a better poker hand'''
+    return int(evaluate_hands(encode_deck(cards)[None, :])[0])
+
+def get_hand_name(value):
+    '''get_hand_name(int) -> str
+    returns the name of the poker hand for a value from evaluate_hand, like "full house"'''
+    return _HAND_NAMES[int(value) >> 20]
+
+def _benchmark_cards(numCards = 520, frames = 200):
+    '''_benchmark_cards(numCards = 520, frames = 200) -> None
+    prints how much memory numCards cards take and how long drawing them takes
+    run with: python playingcards.py benchmark'''
+    import tracemalloc
+    game = gs.Game((1200, 800))
+    deck = get_deck(False, False)
+    get_card_face("A", "spade", "black", "medium")
+
+    tracemalloc.start()
+    startMemory = tracemalloc.get_traced_memory()[0]
+    cards = [Card(game, deck[i % len(deck)]) for i in range(numCards)]
+    for i in range(numCards):
+        cards[i].prewarm()
+        cards[i].flip_card()
+    memory = tracemalloc.get_traced_memory()[0] - startMemory
+
+    # spread the cards over the window so every blit is drawn in full
+    for i in range(numCards):
+        cards[i].pos((100 + i % 20 * 50, 100 + i // 20 * 20))
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        for card in cards:
+            card.update()
+    updateTime = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        for card in cards:
+            card.get_width()
+            card.get_height()
+    sizeTime = time.perf_counter() - start
+
+    print(f"{numCards} cards: {memory / numCards:.0f} bytes per card")
+    print(f"update: {updateTime / frames * 1000:.2f} ms per frame")
+    print(f"get_width and get_height: {sizeTime / frames * 1000:.2f} ms per frame")
+
 # test the cards
 if __name__ == "__main__":
     pygame.init()
-    game = _TestGame()
-    game.mainloop()
+    if sys.argv[1:] == ["benchmark"]:
+        _benchmark_cards()
+    else:
+        game = _TestGame()
+        game.mainloop()
     
     
@@ -2,6 +2,12 @@ import gamesetup as gs
 from asciisetup import *
 import pygame
 import random
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 class SnakeGame(gs.Game):
     '''simple snake game'''
@@ -14,8 +20,8 @@ class SnakeGame(gs.Game):
         self.boardWidth = 39
         self.boardHeight = 26
         
-        # snake
-        self.snake = [(10, 15), (10, 14), (10, 13)]
+        # snake (the head is first)
+        self.set_snake([(10, 15), (10, 14), (10, 13)])
         self.direction = (0, 1)
         self.newDirections = []
         
@@ -69,6 +75,69 @@ class SnakeGame(gs.Game):
                (newDir == "left" and oldDir != (0, 1)) or \
                (newDir == "right" and oldDir != (0, -1))
 
+    def set_snake(self, cells):
+        '''sets the cells of the snake (the head is first)'''
+        # the set of cells the snake covers
+        self.snake = deque()
+        self.snakeCells = set()
+
+        # cells food can spawn on that the snake isn't covering
+        # kept as a list with an index of each cell for swap-removes
+        self.freeCells = []
+        self.freeIndex = {}
+        for row in range(4, self.boardHeight - 4):
+            for col in range(4, self.boardWidth - 4):
+                self.add_free_cell((row, col))
+
+        for cell in reversed(cells):
+            self.push_head(cell)
+
+    def load_from_batch(self, batch, index):
+        '''shows the board at index of a SnakeBatch in this game'''
+        if (batch.boardWidth, batch.boardHeight) != (self.boardWidth, self.boardHeight):
+            raise gs.GameSetupError("SnakeBatch board size doesn't match the game board")
+
+        self.set_snake(batch.get_snake(index))
+        self.direction = batch.get_direction(index)
+        self.newDirections = []
+        self.food.pos(batch.get_food(index))
+        self.score = batch.get_score(index)
+        self.gameOver = batch.is_done(index)
+        self.asciiWindow.update_button("restart", isVisible = self.gameOver)
+
+    def is_food_cell(self, cell):
+        '''checks to see if food can spawn on the cell'''
+        return 4 <= cell[0] <= self.boardHeight - 5 and 4 <= cell[1] <= self.boardWidth - 5
+
+    def add_free_cell(self, cell):
+        '''marks a cell as free for food'''
+        if cell not in self.freeIndex:
+            self.freeIndex[cell] = len(self.freeCells)
+            self.freeCells.append(cell)
+
+    def remove_free_cell(self, cell):
+        '''marks a cell as taken by swapping the last free cell into its place'''
+        index = self.freeIndex.pop(cell, None)
+        if index == None:
+            return
+        last = self.freeCells.pop()
+        if index < len(self.freeCells):
+            self.freeCells[index] = last
+            self.freeIndex[last] = index
+
+    def push_head(self, cell):
+        '''adds a new head to the snake'''
+        self.snake.appendleft(cell)
+        self.snakeCells.add(cell)
+        self.remove_free_cell(cell)
+
+    def pop_tail(self):
+        '''removes the end of the snake'''
+        tail = self.snake.pop()
+        self.snakeCells.discard(tail)
+        if self.is_food_cell(tail):
+            self.add_free_cell(tail)
+
     def last_direction(self):
         '''gets the last direction, including current dir and last in scheduled moves'''
         if len(self.newDirections):
@@ -106,29 +175,29 @@ class SnakeGame(gs.Game):
             return
             
         # check self collision
-        if newHead in self.snake:
+        if newHead in self.snakeCells:
             self.asciiWindow.update_button("restart", isVisible = True)
             self.gameOver = True
             return
             
         # add new head
-        self.snake.insert(0, newHead)
+        self.push_head(newHead)
         
         # check food
         if newHead == self.food.pos():
             self.score += 1
             self.spawn_food()
         else:
-            self.snake.pop()
+            self.pop_tail()
             
     def spawn_food(self):
-        '''spawns food at random location'''
-        while True:
-            row = random.randint(4, self.boardHeight - 5)
-            col = random.randint(4, self.boardWidth - 5)
-            if (row, col) not in self.snake:
-                self.food.pos((row, col))
-                break
+        '''spawns food at random location that the snake isn't on
+        ends the game if the snake covers every spot'''
+        if len(self.freeCells) == 0:
+            self.asciiWindow.update_button("restart", isVisible = True)
+            self.gameOver = True
+            return
+        self.food.pos(random.choice(self.freeCells))
 
     def mouse_click(self, event):
         '''runs on mouse click'''
@@ -164,6 +233,159 @@ class SnakeGame(gs.Game):
         # draw to screen
         self.blit(self.asciiWindow, (0, 0))
 
+class SnakeBatch:
+    '''steps many independent snake boards at once using numpy
+    uses the same rules as SnakeGame: walls are the three cell border,
+    running into the snake ends the board, and eating food grows the snake
+
+    actions are 0 (up), 1 (down), 2 (left), or 3 (right)
+    turning straight back is ignored, like in SnakeGame.handle_key
+    observations are boards of EMPTY, BODY, HEAD, FOOD, and WALL cells'''
+
+    EMPTY, BODY, HEAD, FOOD, WALL = 0, 1, 2, 3, 4
+
+    def __init__(self, numBoards, boardWidth = 39, boardHeight = 26, seed = None):
+        '''SnakeBatch(int, int, int, int) -> SnakeBatch
+        sets up numBoards snake boards
+        seed seeds the food placement'''
+        if np == None:
+            raise gs.GameSetupError("SnakeBatch requires numpy")
+
+        self.numBoards = numBoards
+        self.boardWidth = boardWidth
+        self.boardHeight = boardHeight
+        self.rng = np.random.default_rng(seed)
+        self.moves = np.array([(-1, 0), (1, 0), (0, -1), (0, 1)])
+        self.opposites = np.array([1, 0, 3, 2])
+
+        # each body cell holds the number of moves until the tail leaves it
+        self.body = np.zeros((numBoards, boardHeight, boardWidth), np.int32)
+        self.heads = np.zeros((numBoards, 2), np.int64)
+        self.directions = np.zeros(numBoards, np.int64)
+        self.lengths = np.zeros(numBoards, np.int32)
+        self.scores = np.zeros(numBoards, np.int32)
+        self.food = np.zeros((numBoards, 2), np.int64)
+        self.done = np.zeros(numBoards, bool)
+
+        # the board layout
+        rows = np.arange(boardHeight)[:, None]
+        cols = np.arange(boardWidth)[None, :]
+        self.walls = (rows <= 2) | (rows >= boardHeight - 3) | (cols <= 2) | (cols >= boardWidth - 3)
+        self.foodCells = (rows >= 4) & (rows <= boardHeight - 5) & (cols >= 4) & (cols <= boardWidth - 5)
+
+        self.reset()
+
+    def __len__(self):
+        '''len(SnakeBatch) -> int
+        returns the number of boards'''
+        return self.numBoards
+
+    def reset(self, boards = None):
+        '''SnakeBatch.reset(int[]) -> None
+        starts the boards over (all boards if boards isn't given)'''
+        if boards is None:
+            boards = np.arange(self.numBoards)
+        boards = np.asarray(boards, np.int64)
+        if len(boards) == 0:
+            return
+
+        self.body[boards] = 0
+        for length, col in enumerate((13, 14, 15)):
+            self.body[boards, 10, col] = length + 1
+        self.heads[boards] = (10, 15)
+        self.directions[boards] = 3
+        self.lengths[boards] = 3
+        self.scores[boards] = 0
+        self.done[boards] = False
+        self.spawn_food(boards)
+
+    def spawn_food(self, boards):
+        '''SnakeBatch.spawn_food(int[]) -> None
+        puts food on a random free cell of each board
+        boards without a free cell are done'''
+        free = self.foodCells & (self.body[boards] == 0)
+        keys = self.rng.random(free.shape)
+        keys[~free] = -1
+        spots = keys.reshape(len(boards), -1).argmax(1)
+        self.food[boards, 0], self.food[boards, 1] = np.divmod(spots, self.boardWidth)
+        self.done[boards[~free.any((1, 2))]] = True
+
+    def step(self, actions):
+        '''SnakeBatch.step(int[]) -> (observation, reward, done)
+        moves the snake on every board using actions
+        boards that were done are started over first
+        reward is 1 for eating food, -1 for crashing, and 0 otherwise'''
+        self.reset(np.flatnonzero(self.done))
+        boards = np.arange(self.numBoards)
+
+        # turn the snakes
+        actions = np.asarray(actions, np.int64)
+        turn = (actions >= 0) & (actions <= 3) & (actions != self.opposites[self.directions])
+        self.directions = np.where(turn, actions, self.directions)
+        newHeads = self.heads + self.moves[self.directions]
+        rows, cols = newHeads[:, 0], newHeads[:, 1]
+
+        # check wall and self collision
+        crashed = self.walls[rows.clip(0, self.boardHeight - 1), cols.clip(0, self.boardWidth - 1)] | \
+            (rows < 0) | (rows >= self.boardHeight) | (cols < 0) | (cols >= self.boardWidth)
+        crashed[~crashed] = self.body[boards[~crashed], rows[~crashed], cols[~crashed]] > 0
+        moving = ~crashed
+
+        # move the tails of the snakes that didn't eat
+        ate = moving & (rows == self.food[:, 0]) & (cols == self.food[:, 1])
+        shrinking = moving & ~ate
+        self.body[shrinking] = np.maximum(self.body[shrinking] - 1, 0)
+
+        # add the new heads
+        self.lengths[ate] += 1
+        self.scores[ate] += 1
+        self.body[boards[moving], rows[moving], cols[moving]] = self.lengths[moving]
+        self.heads[moving] = newHeads[moving]
+        self.done = crashed
+
+        if ate.any():
+            self.spawn_food(boards[ate])
+
+        reward = ate.astype(np.float32) - crashed
+        return self.observe(), reward, self.done.copy()
+
+    def observe(self):
+        '''SnakeBatch.observe() -> array
+        returns the boards as an int8 array of EMPTY, BODY, HEAD, FOOD, and WALL cells'''
+        boards = np.arange(self.numBoards)
+        observation = np.where(self.body > 0, self.BODY, self.EMPTY).astype(np.int8)
+        observation[:, self.walls] = self.WALL
+        observation[boards, self.food[:, 0], self.food[:, 1]] = self.FOOD
+        observation[boards, self.heads[:, 0], self.heads[:, 1]] = self.HEAD
+        return observation
+
+    def get_snake(self, index):
+        '''SnakeBatch.get_snake(int) -> list
+        returns the cells of the snake on board index (the head is first)'''
+        rows, cols = np.nonzero(self.body[index])
+        order = np.argsort(-self.body[index, rows, cols], kind = "stable")
+        return [(int(rows[i]), int(cols[i])) for i in order]
+
+    def get_direction(self, index):
+        '''SnakeBatch.get_direction(int) -> (int, int)
+        returns the direction the snake on board index is going'''
+        return tuple(int(value) for value in self.moves[self.directions[index]])
+
+    def get_food(self, index):
+        '''SnakeBatch.get_food(int) -> (int, int)
+        returns the food position on board index'''
+        return int(self.food[index, 0]), int(self.food[index, 1])
+
+    def get_score(self, index):
+        '''SnakeBatch.get_score(int) -> int
+        returns the score on board index'''
+        return int(self.scores[index])
+
+    def is_done(self, index):
+        '''SnakeBatch.is_done(int) -> bool
+        returns if board index has ended'''
+        return bool(self.done[index])
+
 if __name__ == "__main__":
     pygame.init()
     game = SnakeGame()